@@ -0,0 +1,269 @@
+"""
+Benchmarks del Sistema de Álgebra Lineal
+Mide el cálculo (determinante, inversa, lotes), la generación del .tex y la
+compilación a PDF para distintos tamaños, guarda los resultados en JSON y
+compara contra una línea base para detectar regresiones
+
+Uso:
+    python benchmarks.py ejecutar -o base.json
+    python benchmarks.py ejecutar -o nuevo.json --tamanos 4 16 64 --sin-pdf
+    python benchmarks.py comparar base.json nuevo.json --umbral 0.10
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from matrix_operations import (
+    CACHE_FACTORIZACIONES,
+    MatrixGenerator,
+    DeterminantCalculator,
+    InverseCalculator,
+    LinearSystemSolver,
+    RREFCalculator,
+    LUFactorization,
+    factorizar,
+    BatchDeterminantCalculator,
+    BatchInverseCalculator,
+    LaTeXDocumentGenerator,
+    StreamingLaTeXDocumentGenerator,
+)
+from vista_previa import PreviewDocumentGenerator
+
+
+TAMANOS = (4, 8, 16, 32, 64)
+LOTES = (10, 100, 1000)
+TAMANO_LOTE = 4
+COLUMNAS_SISTEMA = 16
+TAMANOS_PDF = (4, 8)
+ESTRUCTURAS = ("diagonal", "triangular_superior", "triangular_inferior", "identidad")
+
+# Arranque de un proceso nuevo: intérprete solo, módulos de cálculo y con PyLaTeX
+IMPORTACIONES = {
+    "python": "pass",
+    "calculo": "from matrix_operations import DeterminantCalculator, InverseCalculator",
+    "latex": "from matrix_operations import LaTeXDocumentGenerator; LaTeXDocumentGenerator()",
+}
+
+
+def medir(funcion, repeticiones=5, tiempo_minimo=0.2):
+    """Mide una función como timeit: ajusta las iteraciones y repite la medición
+
+    Devuelve un diccionario con la mediana y el mínimo (segundos por llamada).
+    """
+    iteraciones = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(iteraciones):
+            funcion()
+        transcurrido = time.perf_counter() - inicio
+        if transcurrido >= tiempo_minimo or iteraciones >= 10 ** 6:
+            break
+        iteraciones *= 10 if transcurrido < tiempo_minimo / 10 else 2
+
+    tiempos = [transcurrido / iteraciones]
+    for _ in range(repeticiones - 1):
+        inicio = time.perf_counter()
+        for _ in range(iteraciones):
+            funcion()
+        tiempos.append((time.perf_counter() - inicio) / iteraciones)
+    return {
+        "mediana": statistics.median(tiempos),
+        "minimo": min(tiempos),
+        "iteraciones": iteraciones,
+        "repeticiones": len(tiempos),
+    }
+
+
+def hay_compilador_latex():
+    """Indica si hay una cadena de herramientas TeX disponible"""
+    return any(shutil.which(nombre) for nombre in ("latexmk", "pdflatex"))
+
+
+def _documento(matriz, doc=None):
+    # Sin factorizaciones de llamadas anteriores, para medir el cálculo completo;
+    # el determinante y la inversa del mismo documento sí la comparten
+    CACHE_FACTORIZACIONES.invalidar()
+    doc = doc or LaTeXDocumentGenerator("Benchmark")
+    doc.documento_determinante(matriz)
+    doc.documento_inversa(matriz)
+    return doc
+
+
+def _documento_flujo(matriz, ruta):
+    with StreamingLaTeXDocumentGenerator(ruta, "Benchmark") as doc:
+        _documento(matriz, doc)
+
+
+def _importar(codigo):
+    """Ejecuta `codigo` en un intérprete nuevo desde el directorio del proyecto"""
+    subprocess.run([sys.executable, "-c", codigo], check=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+
+
+def casos(tamanos=TAMANOS, lotes=LOTES, pdf=True, semilla=0):
+    """Genera los casos (nombre, función sin argumentos) del benchmark"""
+    gen = MatrixGenerator(semilla)
+
+    for nombre, codigo in IMPORTACIONES.items():
+        yield f"importacion[{nombre}]", lambda c=codigo: _importar(c)
+
+    directorio = tempfile.mkdtemp(prefix="benchmark_")
+    try:
+        for n in tamanos:
+            A = gen.matriz_invertible(n, unimodular=False).astype(float)
+            formateador = LaTeXDocumentGenerator("Benchmark")
+
+            # Sin caché de factorizaciones, para medir el cálculo completo en cada llamada
+            yield (f"determinante[n={n}]",
+                   lambda A=A: DeterminantCalculator(A, cache=False).calcular_determinante())
+            yield f"inversa[n={n}]", lambda A=A: InverseCalculator(A, cache=False).calcular_inversa()
+            yield (f"logdet_sin_pasos[n={n}]",
+                   lambda A=A: DeterminantCalculator(A, trazar=False).calcular_logdet())
+            B = gen.rng.standard_normal((n, COLUMNAS_SISTEMA))
+            yield (f"sistema[n={n},k={COLUMNAS_SISTEMA}]",
+                   lambda A=A, B=B: LinearSystemSolver(A, cache=False).resolver(B))
+            yield (f"sistema_por_inversa[n={n},k={COLUMNAS_SISTEMA}]",
+                   lambda A=A, B=B: InverseCalculator(A, cache=False).calcular_inversa() @ B)
+            # Matriz rectangular n × 2n de rango n: Gauss-Jordan con y sin registro de pasos
+            M = gen.rng.standard_normal((n, 2 * n))
+            yield f"rref[m={n},n={2 * n}]", lambda M=M: RREFCalculator(M).calcular_rref()
+            yield (f"rref_sin_pasos[m={n},n={2 * n}]",
+                   lambda M=M: RREFCalculator(M, trazar=False).calcular_rref())
+            yield f"matriz_to_latex[n={n}]", lambda A=A, f=formateador: f._matriz_to_latex(A)
+            yield f"documento[n={n}]", lambda A=A: _documento(A).doc.dumps()
+            yield (f"vista_previa[n={n}]",
+                   lambda A=A: _documento(A, PreviewDocumentGenerator("Benchmark")).dumps())
+            ruta = os.path.join(directorio, f"flujo_{n}")
+            yield f"documento_flujo[n={n}]", lambda A=A, r=ruta: _documento_flujo(A, r)
+
+            # Ruta especializada frente a la eliminación general sobre la misma matriz
+            for tipo in ESTRUCTURAS:
+                E = gen.generar(tipo, n=n).astype(float)
+                yield f"{tipo}[n={n}]", lambda E=E: factorizar(E).inversa()
+                yield f"{tipo}_general[n={n}]", lambda E=E: LUFactorization(E).inversa()
+
+        for k in lotes:
+            pila = gen.matrices_invertibles(TAMANO_LOTE, k, unimodular=False).astype(float)
+            yield (f"lote_determinante[k={k},n={TAMANO_LOTE}]",
+                   lambda p=pila: BatchDeterminantCalculator(p).calcular_determinantes())
+            yield (f"lote_inversa[k={k},n={TAMANO_LOTE}]",
+                   lambda p=pila: BatchInverseCalculator(p).calcular_todo())
+
+        if pdf:
+            for n in TAMANOS_PDF:
+                doc = _documento(gen.matriz_invertible(n, unimodular=False))
+                ruta = os.path.join(directorio, f"doc_{n}")
+                yield f"generar_pdf[n={n}]", lambda d=doc, r=ruta: d.generar_pdf(r)
+
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def ejecutar(tamanos=TAMANOS, lotes=LOTES, pdf=True, repeticiones=5, tiempo_minimo=0.2,
+             filtro=None, mostrar=print):
+    """Ejecuta todos los casos y devuelve los resultados como diccionario"""
+    if pdf and not hay_compilador_latex():
+        mostrar("No se encontró latexmk ni pdflatex: se omiten los casos de PDF")
+        pdf = False
+
+    resultados = {}
+    for nombre, funcion in casos(tamanos, lotes, pdf):
+        if filtro and filtro not in nombre:
+            continue
+        # Los casos de PDF y de arranque son lentos: una sola iteración por repetición
+        minimo = 0 if nombre.startswith(("generar_pdf", "importacion")) else tiempo_minimo
+        resultados[nombre] = medir(funcion, repeticiones, minimo)
+        mostrar(f"{nombre:<40} {resultados[nombre]['mediana'] * 1e3:12.4f} ms")
+
+    return {
+        "metadatos": {
+            "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "pdf": pdf,
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(base, nuevo, umbral=0.10, mostrar=print):
+    """Compara dos resultados y devuelve la lista de casos con regresión
+
+    Hay regresión cuando la mediana nueva supera a la base en más del umbral
+    (0.10 = 10 %).
+    """
+    regresiones = []
+    mostrar(f"{'caso':<40} {'base (ms)':>12} {'nuevo (ms)':>12} {'cambio':>9}")
+    for nombre in sorted(set(base["resultados"]) & set(nuevo["resultados"])):
+        antes = base["resultados"][nombre]["mediana"]
+        despues = nuevo["resultados"][nombre]["mediana"]
+        cambio = despues / antes - 1 if antes > 0 else 0.0
+        marca = ""
+        if cambio > umbral:
+            regresiones.append(nombre)
+            marca = "  REGRESIÓN"
+        mostrar(f"{nombre:<40} {antes * 1e3:12.4f} {despues * 1e3:12.4f} {cambio:+8.1%}{marca}")
+
+    for nombre in sorted(set(base["resultados"]) ^ set(nuevo["resultados"])):
+        origen = "base" if nombre in base["resultados"] else "nuevo"
+        mostrar(f"{nombre:<40} (solo en {origen})")
+    return regresiones
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmarks del Sistema de Álgebra Lineal")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    p_ejecutar = subparsers.add_parser("ejecutar", help="Ejecuta los benchmarks")
+    p_ejecutar.add_argument("-o", "--salida", help="Archivo JSON donde guardar los resultados")
+    p_ejecutar.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS))
+    p_ejecutar.add_argument("--lotes", type=int, nargs="+", default=list(LOTES))
+    p_ejecutar.add_argument("--repeticiones", type=int, default=5)
+    p_ejecutar.add_argument("--tiempo-minimo", type=float, default=0.2,
+                            help="Segundos mínimos por repetición")
+    p_ejecutar.add_argument("--sin-pdf", action="store_true", help="Omite la compilación a PDF")
+    p_ejecutar.add_argument("-k", "--filtro", help="Solo casos cuyo nombre contenga este texto")
+
+    p_comparar = subparsers.add_parser("comparar", help="Compara contra una línea base")
+    p_comparar.add_argument("base", help="JSON de la línea base")
+    p_comparar.add_argument("nuevo", help="JSON de la ejecución nueva")
+    p_comparar.add_argument("--umbral", type=float, default=0.10,
+                            help="Aumento relativo tolerado antes de marcar regresión")
+
+    args = parser.parse_args(argv)
+
+    if args.comando == "ejecutar":
+        resultados = ejecutar(args.tamanos, args.lotes, not args.sin_pdf, args.repeticiones,
+                              args.tiempo_minimo, args.filtro)
+        if args.salida:
+            with open(args.salida, "w", encoding="utf-8") as archivo:
+                json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+            print(f"\n✓ Resultados guardados en {args.salida}")
+        return 0
+
+    with open(args.base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    with open(args.nuevo, encoding="utf-8") as archivo:
+        nuevo = json.load(archivo)
+    regresiones = comparar(base, nuevo, args.umbral)
+    if regresiones:
+        print(f"\n⚠ {len(regresiones)} caso(s) con regresión")
+        return 1
+    print("\n✓ Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,479 @@
+"""
+Compilación de documentos LaTeX a PDF
+Compila varios documentos en paralelo con un pool de procesos acotado,
+cada uno en su propio directorio de trabajo
+"""
+
+import hashlib
+import io
+import json
+import os
+import pathlib
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from instrumentacion import medido
+
+
+# Mismo orden de compiladores que usa PyLaTeX en generate_pdf
+COMPILADORES = (("latexmk", ["--pdf"]), ("pdflatex", []))
+
+# Tamaño de los bloques con que se leen y copian los archivos .tex
+TAMANO_BLOQUE = 1024 ** 2
+
+DIRECTORIO_CACHE = os.environ.get(
+    "PYLATEX_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "pylatex_matrices"))
+
+
+class CachePDF:
+    """Caché en disco de PDFs compilados, direccionada por contenido
+
+    La clave es un hash SHA-256 del código .tex y de la configuración del
+    compilador. En un acierto el PDF guardado se enlaza (o copia) al
+    destino sin ejecutar LaTeX. Las entradas se desalojan por antigüedad
+    (max_edad, en segundos) y por tamaño total (max_bytes), empezando por
+    las usadas hace más tiempo.
+
+    Con enlazar=True se usan enlaces duros en lugar de copias; el PDF de
+    destino comparte entonces el archivo de la caché y no debe modificarse
+    en el lugar.
+    """
+
+    def __init__(self, directorio=None, max_bytes=500 * 1024 ** 2, max_edad=30 * 24 * 3600,
+                 enlazar=False):
+        self.directorio = os.path.abspath(directorio or DIRECTORIO_CACHE)
+        self.max_bytes = max_bytes
+        self.max_edad = max_edad
+        self.enlazar = enlazar
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        os.makedirs(self.directorio, exist_ok=True)
+
+    @staticmethod
+    def clave(tex, compilador=None, compilador_args=None):
+        """Hash del código LaTeX junto con la configuración del compilador
+
+        `tex` es el código o la ruta (os.PathLike) de un archivo .tex, que se
+        lee por bloques; las dos formas dan la misma clave para el mismo
+        contenido.
+        """
+        configuracion = json.dumps([compilador, list(compilador_args or [])])
+        resumen = hashlib.sha256(configuracion.encode("utf-8") + b"\n")
+        if isinstance(tex, os.PathLike):
+            with open(tex, "rb") as archivo:
+                for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE), b""):
+                    resumen.update(bloque)
+        else:
+            resumen.update(tex.encode("utf-8"))
+        return resumen.hexdigest()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave + ".pdf")
+
+    def obtener(self, clave, destino_pdf):
+        """Coloca el PDF cacheado en destino_pdf; devuelve False si no está"""
+        ruta = self._ruta(clave)
+        if not os.path.isfile(ruta) or self._caducado(ruta):
+            self.fallos += 1
+            return False
+
+        os.makedirs(os.path.dirname(os.path.abspath(destino_pdf)), exist_ok=True)
+        if os.path.lexists(destino_pdf):
+            os.remove(destino_pdf)
+        try:
+            if not self.enlazar:
+                raise OSError
+            os.link(ruta, destino_pdf)
+        except OSError:
+            shutil.copyfile(ruta, destino_pdf)
+        os.utime(ruta)  # marca el uso para el desalojo LRU
+        self.aciertos += 1
+        return True
+
+    def guardar(self, clave, origen_pdf):
+        """Guarda un PDF compilado en la caché y aplica el desalojo"""
+        ruta = self._ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        shutil.copyfile(origen_pdf, temporal)
+        os.replace(temporal, ruta)
+        self.limpiar()
+
+    def _caducado(self, ruta):
+        return self.max_edad is not None and time.time() - os.path.getmtime(ruta) > self.max_edad
+
+    def _entradas(self):
+        """Lista (ruta, tamaño, última modificación) de las entradas de la caché"""
+        entradas = []
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith(".pdf") and entrada.is_file():
+                info = entrada.stat()
+                entradas.append((entrada.path, info.st_size, info.st_mtime))
+        return entradas
+
+    def limpiar(self):
+        """Desaloja las entradas caducadas y las más antiguas hasta respetar max_bytes"""
+        entradas = sorted(self._entradas(), key=lambda e: e[2])
+        ahora = time.time()
+        total = sum(tamano for _, tamano, _ in entradas)
+        for ruta, tamano, modificado in entradas:
+            caducado = self.max_edad is not None and ahora - modificado > self.max_edad
+            excedido = self.max_bytes is not None and total > self.max_bytes
+            if not (caducado or excedido):
+                continue
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+            total -= tamano
+            self.desalojos += 1
+
+    def vaciar(self):
+        """Elimina todas las entradas de la caché"""
+        for ruta, _, _ in self._entradas():
+            os.remove(ruta)
+
+    def estadisticas(self):
+        """Contadores de aciertos y fallos y ocupación actual de la caché"""
+        entradas = self._entradas()
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            "desalojos": self.desalojos,
+            "entradas": len(entradas),
+            "bytes": sum(tamano for _, tamano, _ in entradas),
+        }
+
+
+class FormatoPreambulo:
+    """Preámbulo precompilado en un archivo de formato (.fmt) de LaTeX
+
+    La parte fija del preámbulo (\\documentclass y \\usepackage) se vuelca
+    una sola vez con mylatexformat y los documentos posteriores se compilan
+    con -fmt, sin volver a cargar los paquetes. El nombre del formato es un
+    hash del preámbulo fijo, así que cualquier cambio en la lista de paquetes
+    o en sus opciones genera un formato nuevo automáticamente.
+
+    Si un formato no se puede generar, el fallo se recuerda (en memoria y en
+    un archivo .fallo junto a los .fmt, visible para los demás procesos) y
+    no se vuelve a intentar; olvidar_fallos() permite reintentarlo.
+    """
+
+    PREFIJOS_FIJOS = ("\\documentclass", "\\usepackage", "\\RequirePackage")
+
+    def __init__(self, directorio=None, compilador="pdflatex"):
+        self.directorio = os.path.abspath(directorio or os.path.join(DIRECTORIO_CACHE, "formatos"))
+        self.compilador = compilador
+        self.error = None
+        self._fallos = {}
+        os.makedirs(self.directorio, exist_ok=True)
+
+    @classmethod
+    def dividir(cls, tex):
+        """Separa el código en (preámbulo fijo, resto del documento)"""
+        lineas = iter(tex.splitlines(keepends=True))
+        fijo, leido = cls.dividir_lineas(lineas)
+        return fijo, leido + "".join(lineas)
+
+    @classmethod
+    def dividir_lineas(cls, lineas):
+        """Consume de un iterador de líneas solo las del preámbulo fijo
+
+        Devuelve (preámbulo fijo, líneas ya leídas que pertenecen al resto);
+        el resto del documento queda sin leer en el iterador (p. ej. un
+        archivo abierto).
+        """
+        fijo, leido = [], []
+        for linea in lineas:
+            contenido = linea.strip()
+            if contenido.startswith(cls.PREFIJOS_FIJOS):
+                fijo.extend(leido)
+                fijo.append(linea)
+                leido = []
+            else:
+                leido.append(linea)
+                if contenido not in ("", "%"):
+                    break
+        return "".join(fijo), "".join(leido)
+
+    def nombre(self, fijo):
+        """Nombre del formato asociado a un preámbulo fijo"""
+        datos = (self.compilador + "\n" + fijo).encode("utf-8")
+        return "preambulo_" + hashlib.sha256(datos).hexdigest()[:16]
+
+    def preparar(self, fijo):
+        """Devuelve el nombre del formato, generándolo si aún no existe
+
+        Si no se puede generar (p. ej. falta mylatexformat) devuelve None y
+        deja el motivo en `error`; los intentos posteriores con el mismo
+        preámbulo devuelven None sin ejecutar LaTeX.
+        """
+        nombre = self.nombre(fijo)
+        if os.path.isfile(os.path.join(self.directorio, nombre + ".fmt")):
+            return nombre
+        if nombre not in self._fallos:
+            try:
+                with open(self._ruta_fallo(nombre), encoding="utf-8") as archivo:
+                    self._fallos[nombre] = archivo.read()
+            except FileNotFoundError:
+                pass
+        if nombre in self._fallos:
+            self.error = self._fallos[nombre]
+            return None
+
+        with tempfile.TemporaryDirectory(prefix="pylatex_fmt_") as directorio:
+            ruta = os.path.join(directorio, "preambulo.tex")
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                archivo.write(fijo + "\\begin{document}\n\\end{document}\n")
+            comando = [self.compilador, "-ini", "-interaction=nonstopmode", f"-jobname={nombre}",
+                       f"&{self.compilador}", "mylatexformat.ltx", ruta]
+            try:
+                subprocess.run(comando, cwd=directorio, check=True,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            except FileNotFoundError:
+                return self._fallo(nombre, f"No se encontró el compilador {self.compilador}")
+            except subprocess.CalledProcessError as e:
+                salida = e.stdout.decode(errors="replace").strip().splitlines()
+                return self._fallo(nombre, "No se pudo generar el formato:\n"
+                                   + "\n".join(salida[-20:]))
+            temporal = os.path.join(self.directorio, f"{nombre}.{os.getpid()}.tmp")
+            shutil.copyfile(os.path.join(directorio, nombre + ".fmt"), temporal)
+            os.replace(temporal, os.path.join(self.directorio, nombre + ".fmt"))
+        return nombre
+
+    def _ruta_fallo(self, nombre):
+        return os.path.join(self.directorio, nombre + ".fallo")
+
+    def _fallo(self, nombre, error):
+        """Recuerda que el formato `nombre` no se pudo generar y devuelve None"""
+        self.error = self._fallos[nombre] = error
+        temporal = f"{self._ruta_fallo(nombre)}.{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(error)
+        os.replace(temporal, self._ruta_fallo(nombre))
+        return None
+
+    def olvidar_fallos(self):
+        """Olvida los formatos que no se pudieron generar para volver a intentarlo"""
+        self._fallos.clear()
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith(".fallo"):
+                os.remove(entrada.path)
+
+    def comando(self, nombre, ruta_tex, compilador_args=None):
+        """Comando para compilar un documento con el formato `nombre`"""
+        return [self.compilador, f"-fmt={nombre}"] + list(compilador_args or []) + \
+            ["--interaction=nonstopmode", ruta_tex]
+
+    def entorno(self):
+        """Variables de entorno para que LaTeX encuentre los formatos generados"""
+        entorno = dict(os.environ)
+        entorno["TEXFORMATS"] = self.directorio + os.pathsep + entorno.get("TEXFORMATS", "")
+        return entorno
+
+
+def fuente_tex(fuente):
+    """Obtiene el código .tex de un trabajo
+
+    `fuente` puede ser un LaTeXDocumentGenerator, un Document de PyLaTeX,
+    la ruta de un archivo .tex o directamente el código LaTeX.
+    """
+    if hasattr(fuente, "doc"):
+        return fuente.doc.dumps()
+    if hasattr(fuente, "dumps"):
+        return fuente.dumps()
+    if isinstance(fuente, (str, os.PathLike)) and str(fuente).endswith(".tex") \
+            and os.path.isfile(fuente):
+        with open(fuente, encoding="utf-8") as archivo:
+            return archivo.read()
+    if isinstance(fuente, str):
+        return fuente
+    raise TypeError(f"Fuente LaTeX no soportada: {type(fuente).__name__}")
+
+
+def _fuente_compilable(fuente):
+    """Como fuente_tex, pero las rutas de archivos .tex se devuelven como pathlib.Path
+
+    Así compilar_tex las hashea y copia por bloques sin cargarlas enteras
+    en memoria (ni enviarlas completas a los procesos del pool).
+    """
+    if isinstance(fuente, (str, os.PathLike)) and str(fuente).endswith(".tex") \
+            and os.path.isfile(fuente):
+        return pathlib.Path(fuente)
+    return fuente_tex(fuente)
+
+
+def _abrir_tex(tex):
+    """Abre para lectura el código LaTeX o la ruta (os.PathLike) de un archivo .tex"""
+    if isinstance(tex, os.PathLike):
+        return open(tex, encoding="utf-8")
+    return io.StringIO(tex)
+
+
+def _escribir_tex(tex, ruta):
+    """Guarda el código LaTeX en `ruta`; los archivos se copian por bloques"""
+    if isinstance(tex, os.PathLike):
+        if os.path.abspath(tex) != os.path.abspath(ruta):
+            shutil.copyfile(tex, ruta)
+    else:
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(tex)
+
+
+def _escribir_fuente(tex, ruta, formato=None):
+    """Escribe en `ruta` el código a compilar; devuelve el nombre del formato usado o None
+
+    Con un formato precompilado, lo anterior a \\endofdump ya está en el .fmt.
+    Del código solo se cargan en memoria las líneas del preámbulo; el resto
+    se copia por bloques.
+    """
+    nombre_formato = None
+    with _abrir_tex(tex) as origen, open(ruta, "w", encoding="utf-8") as archivo:
+        if formato is not None:
+            fijo, leido = formato.dividir_lineas(origen)
+            nombre_formato = formato.preparar(fijo) if fijo else None
+            archivo.write(fijo if nombre_formato is None else fijo + "\\endofdump\n")
+            archivo.write(leido)
+        shutil.copyfileobj(origen, archivo, TAMANO_BLOQUE)
+    return nombre_formato
+
+
+@medido("compilacion_latex", lambda tex, nombre_archivo, *_: {"archivo": nombre_archivo})
+def compilar_tex(tex, nombre_archivo, compilador=None, compilador_args=None, conservar_tex=True,
+                 cache=None, formato=None):
+    """Compila código LaTeX en un directorio temporal propio
+
+    `tex` es el código LaTeX o la ruta (os.PathLike, p. ej. pathlib.Path) de
+    un archivo .tex, que se hashea y se copia por bloques sin cargarlo
+    entero en memoria. El PDF (y el .tex si conservar_tex=True) se copian a
+    `nombre_archivo` (sin extensión). Si se pasa una CachePDF, un documento
+    ya compilado se toma de la caché sin ejecutar LaTeX. Con un
+    FormatoPreambulo se compila contra el preámbulo precompilado. Devuelve
+    la ruta del PDF generado.
+    """
+    destino = os.path.abspath(nombre_archivo)
+    if cache is not None:
+        clave = cache.clave(tex, compilador, compilador_args)
+        if cache.obtener(clave, destino + ".pdf"):
+            if conservar_tex:
+                _escribir_tex(tex, destino + ".tex")
+            return destino + ".pdf"
+
+    base = os.path.basename(destino) or "documento"
+    if compilador is not None:
+        compiladores = ((compilador, []),)
+    else:
+        compiladores = COMPILADORES
+
+    entorno = None
+    with tempfile.TemporaryDirectory(prefix="pylatex_") as directorio:
+        ruta_tex = os.path.join(directorio, base + ".tex")
+        nombre_formato = _escribir_fuente(tex, ruta_tex, formato)
+        if nombre_formato is not None:
+            compiladores = ((formato.compilador, None),)
+            entorno = formato.entorno()
+
+        for nombre, argumentos in compiladores:
+            if argumentos is None:
+                comando = formato.comando(nombre_formato, ruta_tex, compilador_args)
+            else:
+                comando = [nombre] + argumentos + list(compilador_args or []) + \
+                    ["--interaction=nonstopmode", ruta_tex]
+            try:
+                subprocess.run(comando, cwd=directorio, check=True, env=entorno,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            except FileNotFoundError:
+                continue
+            except subprocess.CalledProcessError as e:
+                salida = e.stdout.decode(errors="replace").strip().splitlines()
+                raise RuntimeError(f"{nombre} terminó con código {e.returncode}:\n"
+                                   + "\n".join(salida[-20:])) from None
+            break
+        else:
+            raise RuntimeError("No se encontró un compilador LaTeX (latexmk o pdflatex)")
+
+        # Se reemplaza el destino en lugar de sobrescribirlo, por si es un
+        # enlace duro a una entrada de la caché
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        temporal = f"{destino}.{os.getpid()}.pdf.tmp"
+        shutil.copyfile(os.path.join(directorio, base + ".pdf"), temporal)
+        os.replace(temporal, destino + ".pdf")
+        if conservar_tex:
+            _escribir_tex(tex, destino + ".tex")
+
+    if cache is not None:
+        cache.guardar(clave, destino + ".pdf")
+    return destino + ".pdf"
+
+
+def _ejecutar_trabajo(nombre_archivo, tex, opciones):
+    """Compila un trabajo del lote y devuelve su resultado sin lanzar excepciones"""
+    inicio = time.perf_counter()
+    resultado = {"nombre": nombre_archivo, "pdf": None, "ok": False, "error": None}
+    try:
+        resultado["pdf"] = compilar_tex(tex, nombre_archivo, **opciones)
+        resultado["ok"] = True
+    except Exception as e:
+        resultado["error"] = str(e)
+    resultado["segundos"] = time.perf_counter() - inicio
+    return resultado
+
+
+def compilar_lote(trabajos, max_procesos=None, cache=None, **opciones):
+    """Compila en paralelo una lista de trabajos (nombre_archivo, fuente)
+
+    Cada documento se compila en un proceso del pool y en su propio
+    directorio de trabajo. Devuelve una lista de diccionarios con las claves
+    nombre, pdf, ok, error y segundos, en el mismo orden de los trabajos;
+    un fallo en un documento no detiene a los demás. Con una CachePDF, los
+    aciertos se resuelven en el proceso principal sin ocupar el pool. Las
+    fuentes que son rutas de archivos .tex no se leen enteras: la clave de
+    la caché y la copia se hacen por bloques y al pool solo llega la ruta.
+    """
+    trabajos = [(nombre, _fuente_compilable(fuente)) for nombre, fuente in trabajos]
+    resultados = [None] * len(trabajos)
+    pendientes = []
+    for indice, (nombre, tex) in enumerate(trabajos):
+        if cache is not None:
+            inicio = time.perf_counter()
+            clave = cache.clave(tex, opciones.get("compilador"), opciones.get("compilador_args"))
+            destino = os.path.abspath(nombre)
+            if cache.obtener(clave, destino + ".pdf"):
+                if opciones.get("conservar_tex", True):
+                    _escribir_tex(tex, destino + ".tex")
+                resultados[indice] = {"nombre": nombre, "pdf": destino + ".pdf", "ok": True,
+                                      "error": None, "cache": True,
+                                      "segundos": time.perf_counter() - inicio}
+                continue
+        pendientes.append(indice)
+    if not pendientes:
+        return resultados
+
+    # Los formatos se generan antes de repartir el trabajo, una vez por preámbulo
+    formato = opciones.get("formato")
+    if formato is not None:
+        preambulos = set()
+        for indice in pendientes:
+            with _abrir_tex(trabajos[indice][1]) as origen:
+                preambulos.add(formato.dividir_lineas(origen)[0])
+        for fijo in preambulos:
+            if fijo:
+                formato.preparar(fijo)
+    procesos = min(max_procesos or os.cpu_count() or 1, len(pendientes))
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = {indice: pool.submit(_ejecutar_trabajo, *trabajos[indice], opciones)
+                   for indice in pendientes}
+        for indice, futuro in futuros.items():
+            resultados[indice] = futuro.result()
+            resultados[indice]["cache"] = False
+            if cache is not None and resultados[indice]["ok"]:
+                nombre, tex = trabajos[indice]
+                clave = cache.clave(tex, opciones.get("compilador"), opciones.get("compilador_args"))
+                cache.guardar(clave, resultados[indice]["pdf"])
+    return resultados
@@ -128,17 +128,11 @@ def menu_matriz_inversa():
     opcion = input("\nSeleccione opción: ")
     
     if opcion == "1":
-        # Generar matriz 2x2 con determinante no nulo
-        while True:
-            matriz = np.random.randint(1, 10, size=(2, 2))
-            if np.linalg.det(matriz) != 0:
-                break
+        # Matriz 2x2 invertible por construcción (sin reintentos)
+        matriz = MatrixGenerator().matriz_invertible(2, unimodular=False)
     elif opcion == "2":
-        # Generar matriz 3x3 con determinante no nulo
-        while True:
-            matriz = np.random.randint(1, 10, size=(3, 3))
-            if np.linalg.det(matriz) != 0:
-                break
+        # Matriz 3x3 invertible por construcción (sin reintentos)
+        matriz = MatrixGenerator().matriz_invertible(3, unimodular=False)
     elif opcion == "3":
         try:
             n = int(input("Ingrese el tamaño de la matriz (n×n): "))
@@ -188,6 +182,8 @@ def menu_matriz_inversa():
 
 def generar_documento_completo():
     """Genera un documento completo con todos los ejemplos"""
+    from compilacion_pdf import compilar_lote
+    
     print("\n--- GENERANDO DOCUMENTO COMPLETO ---")
     print("Este proceso puede tomar unos segundos...")
     
@@ -195,21 +191,31 @@ def generar_documento_completo():
     print("\n[1/3] Generando tipos de matrices...")
     doc1 = LaTeXDocumentGenerator("Tipos de Matrices Aleatorias")
     doc1.documento_tipos_matrices()
-    doc1.generar_pdf("01_tipos_matrices")
     
     # Documento 2: Determinante
     print("[2/3] Generando cálculo de determinante...")
     matriz_det = np.array([[4, 3, 2, 1], [2, 5, 7, 3], [1, 8, 3, 6], [3, 2, 9, 4]])
     doc2 = LaTeXDocumentGenerator("Cálculo de Determinante - Método de Gauss")
     doc2.documento_determinante(matriz_det)
-    doc2.generar_pdf("02_determinante")
     
     # Documento 3: Matriz inversa
     print("[3/3] Generando cálculo de matriz inversa...")
     matriz_inv = np.array([[4, 7, 2], [1, 6, 3], [2, 5, 8]])
     doc3 = LaTeXDocumentGenerator("Cálculo de Matriz Inversa Completo")
     doc3.documento_inversa(matriz_inv)
-    doc3.generar_pdf("03_matriz_inversa")
+    
+    # Los tres documentos se compilan en paralelo
+    print("\nCompilando los documentos en paralelo...")
+    resultados = compilar_lote([
+        ("01_tipos_matrices", doc1),
+        ("02_determinante", doc2),
+        ("03_matriz_inversa", doc3),
+    ])
+    errores = [r for r in resultados if not r["ok"]]
+    if errores:
+        for r in errores:
+            print(f"\n⚠ Error al compilar {r['nombre']}.pdf: {r['error']}")
+        return
     
     print("\n" + "="*60)
     print("✓ TODOS LOS DOCUMENTOS GENERADOS EXITOSAMENTE")
@@ -0,0 +1,202 @@
+"""
+Instrumentación opcional del Sistema de Álgebra Lineal
+Registra tramos con tiempo por fase (eliminación, cofactores, construcción
+del documento, volcado del .tex, compilación LaTeX) junto con datos como el
+número de pasos o los bytes de .tex generados
+
+Está desactivada por defecto; en ese caso `tramo` devuelve siempre el mismo
+objeto vacío y el costo es una llamada a función por fase.
+
+Uso:
+    import instrumentacion
+    instrumentacion.activar()
+    ...  # cálculos y documentos
+    print(instrumentacion.resumen())
+    instrumentacion.exportar_chrome("traza.json")  # abrir en chrome://tracing o Perfetto
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+
+_activa = False
+_tramos = []
+_hooks = []
+_cerrojo = threading.Lock()
+
+
+class _TramoNulo:
+    """Tramo vacío usado cuando la instrumentación está desactivada"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def anotar(self, **datos):
+        pass
+
+
+_TRAMO_NULO = _TramoNulo()
+
+
+class Tramo:
+    """Intervalo de tiempo de una fase, con datos asociados"""
+
+    __slots__ = ("nombre", "datos", "inicio", "duracion", "pid", "hilo")
+
+    def __init__(self, nombre, datos):
+        self.nombre = nombre
+        self.datos = datos
+        self.inicio = None
+        self.duracion = None
+        self.pid = os.getpid()
+        self.hilo = threading.get_ident()
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.duracion = time.perf_counter() - self.inicio
+        if tipo is not None:
+            self.datos["error"] = f"{tipo.__name__}: {valor}"
+        _cerrar(self)
+        return False
+
+    def anotar(self, **datos):
+        """Agrega datos al tramo (p. ej. pasos=..., bytes_tex=...)"""
+        self.datos.update(datos)
+
+    def como_dict(self):
+        return {"nombre": self.nombre, "inicio": self.inicio, "duracion": self.duracion,
+                "pid": self.pid, "hilo": self.hilo, "datos": dict(self.datos)}
+
+
+def tramo(nombre, **datos):
+    """Context manager que mide una fase si la instrumentación está activa"""
+    if not _activa:
+        return _TRAMO_NULO
+    return Tramo(nombre, datos)
+
+
+def medido(nombre, datos=None):
+    """Decorador que mide cada llamada como un tramo
+
+    `datos(*args, resultado)` puede devolver un diccionario con datos que se
+    agregan al tramo (se evalúa solo si la instrumentación está activa).
+    Los argumentos se le pasan siempre en posición, con los valores por
+    defecto, aunque la llamada los haya dado por nombre; si `datos` falla,
+    el error se anota en el tramo y la llamada no se ve afectada.
+    """
+    def decorador(funcion):
+        firma = inspect.signature(funcion)
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activa:
+                return funcion(*args, **kwargs)
+            with Tramo(nombre, {}) as t:
+                resultado = funcion(*args, **kwargs)
+                if datos is not None:
+                    try:
+                        argumentos = firma.bind(*args, **kwargs)
+                        argumentos.apply_defaults()
+                        t.anotar(**datos(*argumentos.args, resultado))
+                    except Exception as e:
+                        t.anotar(error_datos=f"{type(e).__name__}: {e}")
+            return resultado
+        return envoltura
+    return decorador
+
+
+def _cerrar(t):
+    with _cerrojo:
+        _tramos.append(t)
+        hooks = list(_hooks)
+    for hook in hooks:
+        hook(t)
+
+
+def activar(hook=None):
+    """Activa la instrumentación; `hook` (opcional) se llama con cada Tramo al cerrarse"""
+    global _activa
+    if hook is not None:
+        agregar_hook(hook)
+    _activa = True
+
+
+def desactivar():
+    """Desactiva la instrumentación (los tramos ya registrados se conservan)"""
+    global _activa
+    _activa = False
+
+
+def esta_activa():
+    return _activa
+
+
+def agregar_hook(hook):
+    """Registra una función que recibe cada Tramo al cerrarse"""
+    with _cerrojo:
+        _hooks.append(hook)
+
+
+def quitar_hook(hook):
+    with _cerrojo:
+        _hooks.remove(hook)
+
+
+def limpiar():
+    """Descarta los tramos registrados"""
+    with _cerrojo:
+        _tramos.clear()
+
+
+def tramos():
+    """Copia de la lista de tramos registrados"""
+    with _cerrojo:
+        return list(_tramos)
+
+
+def resumen():
+    """Totales por fase: número de tramos, segundos y suma de los datos numéricos"""
+    fases = {}
+    for t in tramos():
+        fase = fases.setdefault(t.nombre, {"llamadas": 0, "segundos": 0.0})
+        fase["llamadas"] += 1
+        fase["segundos"] += t.duracion
+        for clave, valor in t.datos.items():
+            if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+                fase[clave] = fase.get(clave, 0) + valor
+    return fases
+
+
+def exportar_json(ruta):
+    """Guarda los tramos y el resumen en un archivo JSON"""
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump({"tramos": [t.como_dict() for t in tramos()], "resumen": resumen()},
+                  archivo, indent=2, ensure_ascii=False, default=str)
+
+
+def exportar_chrome(ruta):
+    """Guarda los tramos en el formato Trace Event de Chrome (chrome://tracing, Perfetto)"""
+    eventos = [{
+        "name": t.nombre,
+        "ph": "X",
+        "ts": t.inicio * 1e6,
+        "dur": t.duracion * 1e6,
+        "pid": t.pid,
+        "tid": t.hilo,
+        "args": t.datos,
+    } for t in tramos()]
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, archivo,
+                  ensure_ascii=False, default=str)
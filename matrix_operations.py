@@ -2,17 +2,121 @@
 Sistema de Álgebra Lineal con PyLaTeX
 Generación de matrices aleatorias, cálculo de determinantes e inversas
 con documentación paso a paso en LaTeX
+
+Las clases de cálculo solo dependen de NumPy: PyLaTeX se importa la primera
+vez que se crea un LaTeXDocumentGenerator.
 """
 
 import numpy as np
-from pylatex import Document, Section, Subsection, Math, Matrix as LatexMatrix
-from pylatex import Package, NoEscape, Alignat
-from pylatex.utils import bold
-import random
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+import contextlib
+from fractions import Fraction
+import hashlib
+import io
+import itertools
+import os
+import pathlib
+import threading
+
+from instrumentacion import medido, tramo
+
+
+_pylatex = None
+
+
+def _cargar_pylatex():
+    """Importa PyLaTeX bajo demanda (una sola vez por proceso)"""
+    global _pylatex
+    if _pylatex is None:
+        with tramo("importacion_pylatex"):
+            import pylatex
+        _pylatex = pylatex
+    return _pylatex
 
 
 class MatrixGenerator:
-    """Clase para generar diferentes tipos de matrices aleatorias"""
+    """Clase para generar diferentes tipos de matrices aleatorias
+    
+    Los métodos estáticos usan el estado global de np.random. Una instancia
+    creada con una semilla usa su propio np.random.Generator y permite
+    generar pilas (k, m, n) reproducibles con generar_lote.
+    """
+    
+    # Dimensiones (m, n) por defecto de cada tipo, como en los métodos estáticos
+    TIPOS = {
+        "fila": (1, 5),
+        "columna": (5, 1),
+        "cuadrada": (4, 4),
+        "rectangular": (3, 5),
+        "diagonal": (4, 4),
+        "triangular_superior": (4, 4),
+        "triangular_inferior": (4, 4),
+        "identidad": (4, 4),
+        "nula": (3, 3),
+    }
+    
+    def __init__(self, semilla=None):
+        self.rng = np.random.default_rng(semilla)
+    
+    def generar_lote(self, tipo, k=1, m=None, n=None, rango=(1, 10)):
+        """Genera una pila (k, m, n) de matrices del tipo indicado en una sola llamada"""
+        if tipo not in self.TIPOS:
+            raise ValueError(f"Tipo de matriz no soportado: {tipo}")
+        m_defecto, n_defecto = self.TIPOS[tipo]
+        if tipo in ("fila", "columna"):
+            # Para vectores basta con indicar su longitud en n (fila) o m (columna)
+            m, n = (1, n or m or n_defecto) if tipo == "fila" else (m or n or m_defecto, 1)
+        elif tipo in ("rectangular", "nula"):
+            m, n = m or m_defecto, n or n_defecto
+        else:
+            m = n = n or m or n_defecto
+        
+        if tipo == "identidad":
+            return np.broadcast_to(np.eye(n, dtype=int), (k, n, n)).copy()
+        if tipo == "nula":
+            return np.zeros((k, m, n), dtype=int)
+        if tipo == "diagonal":
+            lote = np.zeros((k, n, n), dtype=int)
+            indices = np.arange(n)
+            lote[:, indices, indices] = self.rng.integers(rango[0], rango[1], size=(k, n))
+            return lote
+        
+        lote = self.rng.integers(rango[0], rango[1], size=(k, m, n))
+        if tipo == "triangular_superior":
+            return np.triu(lote)
+        if tipo == "triangular_inferior":
+            return np.tril(lote)
+        return lote
+    
+    def generar(self, tipo, m=None, n=None, rango=(1, 10)):
+        """Genera una sola matriz del tipo indicado"""
+        return self.generar_lote(tipo, 1, m, n, rango)[0]
+    
+    def matrices_invertibles(self, n=3, k=1, rango=(-3, 4), unimodular=True):
+        """Genera k matrices enteras invertibles por construcción, sin rechazo
+        
+        Cada matriz es P·L·U con P una permutación, L triangular inferior con
+        unos en la diagonal y U triangular superior. Con unimodular=True la
+        diagonal de U es ±1, de modo que det = ±1 y la inversa es entera; si
+        no, la diagonal toma valores no nulos de `rango`.
+        """
+        indices = np.arange(n)
+        L = np.tril(self.rng.integers(rango[0], rango[1], size=(k, n, n)), -1)
+        L[:, indices, indices] = 1
+        U = np.triu(self.rng.integers(rango[0], rango[1], size=(k, n, n)), 1)
+        if unimodular:
+            U[:, indices, indices] = self.rng.choice([-1, 1], size=(k, n))
+        else:
+            no_nulos = np.array([v for v in range(rango[0], rango[1]) if v != 0])
+            U[:, indices, indices] = self.rng.choice(no_nulos, size=(k, n))
+        
+        permutaciones = self.rng.permuted(np.tile(indices, (k, 1)), axis=1)
+        return (L @ U)[np.arange(k)[:, None], permutaciones]
+    
+    def matriz_invertible(self, n=3, rango=(-3, 4), unimodular=True):
+        """Genera una matriz entera invertible por construcción"""
+        return self.matrices_invertibles(n, 1, rango, unimodular)[0]
     
     @staticmethod
     def matriz_fila(n=5, rango=(1, 10)):
@@ -64,66 +168,614 @@ class MatrixGenerator:
         return np.zeros((m, n), dtype=int)
 
 
+class RegistroPasos:
+    """Registro compacto de las operaciones de fila de una eliminación
+    
+    Solo se guardan las operaciones (intercambios, filas actualizadas y sus
+    factores); las matrices de cada paso se reconstruyen bajo demanda al
+    recorrer el registro, aplicando las operaciones sobre la matriz original.
+    """
+    
+    def __init__(self, matriz_original):
+        self.matriz_original = np.array(matriz_original, dtype=float)
+        self.operaciones = []
+        self._num_pasos = 1
+    
+    def registrar_intercambio(self, i, k):
+        """Registra el intercambio de las filas i y k"""
+        self.operaciones.append(("intercambio", i, k, None))
+        self._num_pasos += 1
+    
+    def registrar_eliminacion(self, i, filas, factores):
+        """Registra la actualización F_j → F_j - factor·F_i para varias filas"""
+        self.operaciones.append(("eliminacion", i, filas, factores))
+        self._num_pasos += len(filas)
+    
+    def __len__(self):
+        return self._num_pasos
+    
+    def __iter__(self):
+        """Genera los pasos (descripcion, matriz) reconstruyendo cada matriz"""
+        matriz = self.matriz_original.copy()
+        yield ("Matriz original:", matriz.copy())
+        
+        for tipo, i, datos, factores in self.operaciones:
+            if tipo == "intercambio":
+                matriz[[i, datos]] = matriz[[datos, i]]
+                yield (f"Intercambio F{i+1} ↔ F{datos+1}:", matriz.copy())
+            else:
+                for j, factor in zip(datos, factores):
+                    matriz[j] = matriz[j] - factor * matriz[i]
+                    yield (f"F{j+1} → F{j+1} - ({factor:.2f})F{i+1}:", matriz.copy())
+    
+    def __getitem__(self, indice):
+        """Acceso por índice o por slice (reconstruye hasta el paso pedido)"""
+        if isinstance(indice, slice):
+            return list(itertools.islice(self, *indice.indices(len(self))))
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice de paso fuera de rango")
+        return next(itertools.islice(self, indice, None))
+    
+    def sobre(self, matriz):
+        """Mismo registro aplicado a otra matriz con las mismas filas (p. ej. la aumentada [A | b])"""
+        registro = type(self)(matriz)
+        registro.operaciones = list(self.operaciones)
+        registro._num_pasos = self._num_pasos
+        return registro
+
+
 class DeterminantCalculator:
-    """Clase para calcular determinantes usando el método de Gauss"""
+    """Clase para calcular determinantes usando el método de Gauss
     
-    def __init__(self, matriz):
+    Con trazar=False no se registran pasos ni se guardan copias de la
+    matriz: se acepta un arreglo, un memmap o la ruta de un archivo .npy y
+    el cálculo se hace por bloques con slogdet_por_bloques.
+    """
+    
+    def __init__(self, matriz, cache=None, trazar=True):
+        self.trazar = trazar
+        self.cache = cache
+        self.factorizacion = None
+        self.estructura = None
+        self.multiplicadores = 1
+        if not trazar:
+            self.fuente = matriz
+            self.matriz_original = self.matriz = None
+            self.pasos = None
+            return
         self.matriz_original = np.array(matriz, dtype=float)
         self.matriz = np.array(matriz, dtype=float)
-        self.pasos = []
-        self.multiplicadores = 1
+        self.pasos = RegistroPasos(self.matriz)
         
+    @medido("eliminacion", lambda calc, det: {"n": len(calc.matriz) if calc.trazar else None,
+                                              "pasos": len(calc.pasos) if calc.trazar else 0})
     def calcular_determinante(self):
-        """Calcula el determinante usando eliminación gaussiana"""
-        n = len(self.matriz)
-        self.pasos.append(("Matriz original:", self.matriz.copy()))
+        """Calcula el determinante usando eliminación gaussiana
+        
+        La eliminación con pivoteo parcial es la factorización LU de la
+        matriz, que se toma de la caché de factorizaciones si ya se calculó
+        para la misma matriz. Los pasos se obtienen de ella de forma compacta
+        en un RegistroPasos. Si la matriz es diagonal o triangular no hay
+        eliminación y el registro solo tiene la matriz original.
+        """
+        if not self.trazar:
+            # Puede desbordarse a inf/0 en matrices grandes; ver calcular_logdet
+            signo, logdet = self.calcular_logdet()
+            with np.errstate(over="ignore"):
+                return signo * np.exp(logdet)
+        
+        f = obtener_factorizacion(self.matriz_original, self.cache)
+        self.factorizacion = f
+        self.estructura = f.estructura
+        self.pasos = f.registro()
+        
+        # Verificar si algún pivote es cero (la eliminación se detiene ahí)
+        if f.primera_singular is not None:
+            k = f.primera_singular + 1
+            self.multiplicadores = (-1) ** int(np.count_nonzero(f.pivotes[:k] != np.arange(k)))
+            self.matriz = self.pasos[-1][1]
+            return 0
+        
+        # Calcular el determinante como producto de la diagonal
+        self.multiplicadores = f.signo
+        self.matriz = f.U.copy()
+        determinante = self.multiplicadores * np.prod(np.diag(self.matriz))
+        return determinante
+    
+    def calcular_logdet(self, tamano_bloque=128):
+        """Devuelve (signo, log|det|) sin desbordamiento, como np.linalg.slogdet"""
+        if not self.trazar:
+            return slogdet_por_bloques(self.fuente, tamano_bloque)
+        f = obtener_factorizacion(self.matriz_original, self.cache)
+        if f.singular:
+            return 0.0, -np.inf
+        diagonal = np.diag(f.U)
+        return float(f.signo * np.prod(np.sign(diagonal))), float(np.sum(np.log(np.abs(diagonal))))
+
+
+def _leer_npy(ruta, filas_por_bloque=128):
+    """Lee un archivo .npy como matriz float64 C-contigua, por franjas de filas"""
+    with open(ruta, "rb") as archivo:
+        version = np.lib.format.read_magic(archivo)
+        if version == (1, 0):
+            forma, fortran, tipo = np.lib.format.read_array_header_1_0(archivo)
+        else:
+            forma, fortran, tipo = np.lib.format.read_array_header_2_0(archivo)
+        if fortran or tipo.hasobject or len(forma) != 2:
+            return np.array(np.load(ruta, mmap_mode="r"), dtype=np.float64, order="C")
+        A = np.empty(forma, dtype=np.float64)
+        for r0 in range(0, forma[0], filas_por_bloque):
+            r1 = min(r0 + filas_por_bloque, forma[0])
+            A[r0:r1] = np.fromfile(archivo, dtype=tipo, count=(r1 - r0) * forma[1]).reshape(r1 - r0, -1)
+    return A
+
+
+@medido("eliminacion_bloques")
+def slogdet_por_bloques(fuente, tamano_bloque=128, sobrescribir=False, tol=1e-10):
+    """Signo y logaritmo del valor absoluto del determinante, por bloques
+    
+    `fuente` puede ser un arreglo, un memmap o la ruta de un archivo .npy
+    (que se lee por franjas directamente a la copia de trabajo, sin
+    mapearlo completo en memoria). Se trabaja sobre una sola copia en
+    float64 (o sobre la propia matriz con sobrescribir=True) con una
+    factorización LU por bloques con pivoteo parcial; la actualización del
+    resto de la matriz se hace por franjas de filas para que los temporales
+    no crezcan con n². Devuelve (0.0, -inf) si la matriz es singular, es
+    decir, si algún pivote es menor que `tol` en valor absoluto (la misma
+    tolerancia que LUFactorization, para que ambos modos coincidan).
+    """
+    if isinstance(fuente, (str, os.PathLike)):
+        A = _leer_npy(fuente, tamano_bloque)
+    elif sobrescribir and isinstance(fuente, np.ndarray) and fuente.dtype == np.float64 \
+            and fuente.flags.c_contiguous and fuente.flags.writeable:
+        A = fuente
+    else:
+        A = np.array(fuente, dtype=np.float64, order="C")
+    n = len(A)
+    if A.shape != (n, n):
+        raise ValueError("Se esperaba una matriz cuadrada")
+    
+    signo = 1.0
+    logdet = 0.0
+    for k0 in range(0, n, tamano_bloque):
+        k1 = min(k0 + tamano_bloque, n)
+        
+        # Factorización del panel de columnas k0:k1 (intercambiando filas completas)
+        for j in range(k0, k1):
+            p = j + int(np.argmax(np.abs(A[j:, j])))
+            if abs(A[p, j]) < tol:
+                return 0.0, -np.inf
+            if p != j:
+                A[[j, p]] = A[[p, j]]
+                signo = -signo
+            pivote = A[j, j]
+            signo *= np.sign(pivote)
+            logdet += np.log(abs(pivote))
+            A[j+1:, j] /= pivote
+            A[j+1:, j+1:k1] -= np.outer(A[j+1:, j], A[j, j+1:k1])
+        
+        if k1 == n:
+            break
+        
+        # Fila de bloques de U: U12 = L11⁻¹ A12
+        for j in range(k0, k1 - 1):
+            A[j+1:k1, k1:] -= np.outer(A[j+1:k1, j], A[j, k1:])
+        
+        # Complemento de Schur A22 -= L21 U12, por franjas de filas
+        U12 = A[k0:k1, k1:]
+        for r0 in range(k1, n, tamano_bloque):
+            r1 = min(r0 + tamano_bloque, n)
+            A[r0:r1, k1:] -= A[r0:r1, k0:k1] @ U12
+    
+    return float(signo), float(logdet)
+
+
+def _adjunta_svd(matrices):
+    """Adjunta por SVD, válida también para matrices singulares
+    
+    Acepta una matriz (n, n) o una pila (k, n, n).
+    """
+    U, sigma, Vt = np.linalg.svd(matrices)
+    # Producto de todos los valores singulares excepto el k-ésimo
+    unos = np.ones(sigma.shape[:-1] + (1,))
+    previos = np.cumprod(np.concatenate([unos, sigma[..., :-1]], axis=-1), axis=-1)
+    siguientes = np.cumprod(np.concatenate([unos, sigma[..., :0:-1]], axis=-1), axis=-1)[..., ::-1]
+    adj_sigma = previos * siguientes
+    signo = np.linalg.det(U) * np.linalg.det(Vt)
+    V = np.swapaxes(Vt, -1, -2)
+    return np.asarray(signo)[..., None, None] * (V * adj_sigma[..., None, :]) @ np.swapaxes(U, -1, -2)
+
+
+class LUFactorization:
+    """Factorización PA = LU con pivoteo parcial (mismo pivote que el método de Gauss)
+    
+    Los arreglos L y U y los resultados derivados (inversa, adjunta) son de
+    solo lectura, ya que la factorización puede compartirse por medio de
+    una FactorizationCache.
+    """
+    
+    estructura = "general"
+    
+    def __init__(self, matriz, tol=1e-10):
+        self.matriz = np.array(matriz, dtype=float)
+        self.n = len(self.matriz)
+        self.tol = tol
+        self.permutacion = np.arange(self.n)
+        self.pivotes = np.arange(self.n)
+        self.signo = 1
+        self.singular = False
+        self.primera_singular = None
+        self._inversa = None
+        self._adjunta = None
+        self._factorizar()
+        for arreglo in (self.matriz, self.L, self.U, self.permutacion, self.pivotes):
+            arreglo.setflags(write=False)
+    
+    @medido("factorizacion_lu", lambda f, _: {"n": f.n})
+    def _factorizar(self):
+        """Elimina columna a columna guardando los multiplicadores en L"""
+        n = self.n
+        U = self.matriz.copy()
+        L = np.eye(n)
         
         for i in range(n):
-            # Búsqueda de pivote
-            max_fila = i
-            for k in range(i+1, n):
-                if abs(self.matriz[k][i]) > abs(self.matriz[max_fila][i]):
-                    max_fila = k
-            
-            # Intercambio de filas si es necesario
+            max_fila = i + int(np.argmax(np.abs(U[i:, i])))
+            self.pivotes[i] = max_fila
             if max_fila != i:
-                self.matriz[[i, max_fila]] = self.matriz[[max_fila, i]]
-                self.multiplicadores *= -1
-                self.pasos.append((f"Intercambio F{i+1} ↔ F{max_fila+1}:", self.matriz.copy()))
+                U[[i, max_fila]] = U[[max_fila, i]]
+                L[[i, max_fila], :i] = L[[max_fila, i], :i]
+                self.permutacion[[i, max_fila]] = self.permutacion[[max_fila, i]]
+                self.signo *= -1
             
-            # Verificar si el pivote es cero
-            if abs(self.matriz[i][i]) < 1e-10:
-                return 0
+            if abs(U[i, i]) < self.tol:
+                if not self.singular:
+                    self.primera_singular = i
+                self.singular = True
+                continue
             
-            # Eliminación hacia abajo
-            for j in range(i+1, n):
-                if self.matriz[j][i] != 0:
-                    factor = self.matriz[j][i] / self.matriz[i][i]
-                    self.matriz[j] = self.matriz[j] - factor * self.matriz[i]
-                    self.pasos.append((f"F{j+1} → F{j+1} - ({factor:.2f})F{i+1}:", self.matriz.copy()))
+            # Solo las filas con elemento no nulo, igual que en el método de Gauss
+            filas = i + 1 + np.flatnonzero(U[i+1:, i])
+            if len(filas):
+                factores = U[filas, i] / U[i, i]
+                L[filas, i] = factores
+                U[filas] -= np.outer(factores, U[i])
         
-        # Calcular el determinante como producto de la diagonal
-        determinante = self.multiplicadores * np.prod(np.diag(self.matriz))
-        return determinante
+        self.L = L
+        self.U = U
+    
+    def registro(self):
+        """Registro de pasos de la eliminación de Gauss que produjo esta factorización
+        
+        Los intercambios posteriores mueven las filas de L; aquí se deshacen
+        para recuperar, en cada paso, las filas actualizadas y sus factores.
+        El registro termina en el primer pivote nulo, como el método de Gauss.
+        """
+        n = self.n
+        fin = n if self.primera_singular is None else self.primera_singular + 1
+        # posicion[j]: fila de L donde terminó la fila que ocupaba j en el paso i
+        posicion = np.arange(n)
+        pasos = []
+        for i in range(n - 1, -1, -1):
+            if i < fin:
+                operaciones = []
+                if self.pivotes[i] != i:
+                    operaciones.append(("intercambio", i, int(self.pivotes[i])))
+                if i != self.primera_singular:
+                    factores = self.L[posicion[i+1:], i]
+                    no_nulos = np.flatnonzero(factores)
+                    if len(no_nulos):
+                        operaciones.append(("eliminacion", i, i + 1 + no_nulos, factores[no_nulos]))
+                pasos.append(operaciones)
+            p = self.pivotes[i]
+            posicion[[i, p]] = posicion[[p, i]]
+        
+        registro = RegistroPasos(self.matriz)
+        for operaciones in reversed(pasos):
+            for operacion in operaciones:
+                if operacion[0] == "intercambio":
+                    registro.registrar_intercambio(*operacion[1:])
+                else:
+                    registro.registrar_eliminacion(*operacion[1:])
+        return registro
+    
+    def determinante(self):
+        """Determinante a partir de la diagonal de U"""
+        if self.singular:
+            return 0.0
+        return self.signo * np.prod(np.diag(self.U))
+    
+    def resolver(self, b):
+        """Resuelve A x = b (b puede ser un vector o una matriz de columnas)"""
+        if self.singular:
+            raise ValueError("La matriz es singular, el sistema no tiene solución única")
+        b = np.array(b, dtype=float)
+        y = b[self.permutacion]
+        
+        # Sustitución hacia adelante (L tiene diagonal unitaria)
+        for i in range(self.n):
+            y[i] -= self.L[i, :i] @ y[:i]
+        
+        # Sustitución hacia atrás
+        for i in range(self.n - 1, -1, -1):
+            y[i] = (y[i] - self.U[i, i+1:] @ y[i+1:]) / self.U[i, i]
+        return y
+    
+    def inversa(self):
+        """Matriz inversa resolviendo A X = I con la factorización"""
+        if self._inversa is None:
+            self._inversa = self.resolver(np.eye(self.n))
+            self._inversa.setflags(write=False)
+        return self._inversa
+    
+    def adjunta(self):
+        """Matriz adjunta: adj(A) = det(A)·A⁻¹
+        
+        Si la matriz es singular se usa la SVD A = UΣVᵀ, de donde
+        adj(A) = det(U)·det(Vᵀ)·V·adj(Σ)·Uᵀ.
+        """
+        if self._adjunta is None:
+            if not self.singular:
+                self._adjunta = self.determinante() * self.inversa()
+            else:
+                self._adjunta = _adjunta_svd(self.matriz)
+            self._adjunta.setflags(write=False)
+        return self._adjunta
+
+
+# Estructuras reconocidas por detectar_estructura y su nombre en los documentos
+ESTRUCTURAS = {
+    "nula": "nula",
+    "identidad": "la identidad",
+    "diagonal": "diagonal",
+    "triangular_superior": "triangular superior",
+    "triangular_inferior": "triangular inferior",
+}
+
+
+# Cómo se obtiene la solución de A x = b a partir de cada factorización
+SUSTITUCIONES = {
+    "general": "por sustitución hacia adelante (L y = P b) y después hacia atrás (U x = y)",
+    "triangular_superior": "por sustitución hacia atrás",
+    "triangular_inferior": "por sustitución hacia adelante",
+    "diagonal": "dividiendo cada ecuación por su elemento diagonal",
+    "identidad": "directamente, ya que x = b",
+}
+
+
+def detectar_estructura(matriz):
+    """Clasifica una matriz cuadrada según sus ceros: una clave de ESTRUCTURAS o "general" """
+    A = np.asarray(matriz)
+    if A.ndim != 2 or A.shape[0] != A.shape[1] or A.size == 0:
+        return "general"
+    # Caso más común: ambas esquinas no nulas, sin recorrer la matriz
+    if len(A) > 1 and A[-1, 0] != 0 and A[0, -1] != 0:
+        return "general"
+    inferior = np.any(np.tril(A, -1))
+    superior = np.any(np.triu(A, 1))
+    if inferior and superior:
+        return "general"
+    if inferior:
+        return "triangular_inferior"
+    if superior:
+        return "triangular_superior"
+    diagonal = np.diagonal(A)
+    if not np.any(diagonal):
+        return "nula"
+    if np.all(diagonal == 1):
+        return "identidad"
+    return "diagonal"
+
+
+class StructuredFactorization(LUFactorization):
+    """Factorización de matrices diagonales, triangulares, identidad y nulas
+    
+    No hace eliminación: una triangular superior ya es U (L = I) y una
+    triangular inferior se escribe como A = (A·D⁻¹)·D con D su diagonal. El
+    determinante es el producto de la diagonal, la inversa de una diagonal
+    se calcula elemento a elemento y la de una triangular por sustitución.
+    """
+    
+    def __init__(self, matriz, estructura=None, tol=1e-10):
+        self.estructura = estructura or detectar_estructura(matriz)
+        if self.estructura not in ESTRUCTURAS:
+            raise ValueError(f"La matriz no tiene una estructura especial: {self.estructura}")
+        super().__init__(matriz, tol)
+    
+    @medido("factorizacion_estructura", lambda f, _: {"n": f.n, "estructura": f.estructura})
+    def _factorizar(self):
+        """Toma L y U directamente de la matriz"""
+        diagonal = np.diag(self.matriz)
+        nulos = np.flatnonzero(np.abs(diagonal) < self.tol)
+        if len(nulos):
+            self.singular = True
+            self.primera_singular = int(nulos[0])
+        
+        if self.estructura == "triangular_inferior":
+            # Si es singular L no existe; no se usa (resolver e inversa lo rechazan)
+            self.L = np.eye(self.n) if self.singular else self.matriz / diagonal
+            self.U = np.diag(diagonal)
+        else:
+            self.L = np.eye(self.n)
+            self.U = self.matriz.copy()
+    
+    def registro(self):
+        """Registro de pasos: solo la matriz original, no hace falta eliminar"""
+        return RegistroPasos(self.matriz)
+    
+    def resolver(self, b):
+        """Resuelve A x = b por división (diagonal) o por sustitución (triangular)"""
+        if self.singular:
+            raise ValueError("La matriz es singular, el sistema no tiene solución única")
+        b = np.array(b, dtype=float)
+        diagonal = np.diag(self.matriz)
+        if self.estructura in ("diagonal", "identidad"):
+            return b / (diagonal if b.ndim == 1 else diagonal[:, None])
+        
+        A = self.matriz
+        if self.estructura == "triangular_superior":
+            for i in range(self.n - 1, -1, -1):
+                b[i] = (b[i] - A[i, i+1:] @ b[i+1:]) / diagonal[i]
+        else:
+            for i in range(self.n):
+                b[i] = (b[i] - A[i, :i] @ b[:i]) / diagonal[i]
+        return b
+    
+    def adjunta(self):
+        """Matriz adjunta; la de una diagonal es diagonal, con el producto de los demás elementos"""
+        if self._adjunta is None and self.estructura in ("diagonal", "identidad", "nula"):
+            diagonal = np.diag(self.matriz)
+            anteriores = np.concatenate(([1.0], np.cumprod(diagonal[:-1])))
+            posteriores = np.concatenate((np.cumprod(diagonal[:0:-1])[::-1], [1.0]))
+            self._adjunta = np.diag(anteriores * posteriores)
+            self._adjunta.setflags(write=False)
+        return super().adjunta()
+
+
+def factorizar(matriz, tol=1e-10):
+    """Factoriza la matriz, con la ruta especializada si es diagonal, triangular, identidad o nula"""
+    estructura = detectar_estructura(matriz)
+    if estructura == "general":
+        return LUFactorization(matriz, tol)
+    return StructuredFactorization(matriz, estructura, tol)
+
+
+class FactorizationCache:
+    """Caché LRU de factorizaciones LU indexada por el contenido de la matriz
+    
+    Permite que el determinante, la inversa y los documentos de una misma
+    matriz compartan una sola factorización. Se acota por número de
+    entradas y por bytes ocupados.
+    """
+    
+    # Arreglos n×n de una entrada: la matriz, L, U y, más adelante, la inversa y la adjunta
+    ARREGLOS_POR_ENTRADA = 5
+    
+    def __init__(self, max_entradas=64, max_bytes=256 * 1024 ** 2):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._cerrojo = threading.Lock()
+    
+    @staticmethod
+    def clave(matriz, tol=1e-10):
+        """Hash del contenido (valores, forma) de la matriz convertida a float"""
+        arreglo = np.ascontiguousarray(matriz, dtype=float)
+        resumen = hashlib.blake2b(arreglo.tobytes(), digest_size=20)
+        resumen.update(f"{arreglo.shape}|{tol}".encode())
+        return resumen.hexdigest()
+    
+    def obtener(self, matriz, tol=1e-10):
+        """Devuelve la factorización de la matriz, calculándola solo si no está en caché"""
+        clave = self.clave(matriz, tol)
+        with self._cerrojo:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self._entradas[clave]
+            self.fallos += 1
+        
+        factorizacion = factorizar(matriz, tol)
+        with self._cerrojo:
+            if clave not in self._entradas:
+                self._entradas[clave] = factorizacion
+                self._bytes += self._tamano(factorizacion)
+                self._desalojar()
+        return factorizacion
+    
+    @classmethod
+    def _tamano(cls, factorizacion):
+        """Bytes que puede llegar a ocupar una entrada, con los resultados diferidos"""
+        return cls.ARREGLOS_POR_ENTRADA * factorizacion.matriz.nbytes
+    
+    def _desalojar(self):
+        while self._entradas and (len(self._entradas) > self.max_entradas
+                                  or self._bytes > self.max_bytes):
+            _, factorizacion = self._entradas.popitem(last=False)
+            self._bytes -= self._tamano(factorizacion)
+    
+    def invalidar(self, matriz=None, tol=1e-10):
+        """Descarta la factorización de una matriz, o todas si no se indica ninguna"""
+        with self._cerrojo:
+            if matriz is None:
+                self._entradas.clear()
+                self._bytes = 0
+                return
+            factorizacion = self._entradas.pop(self.clave(matriz, tol), None)
+            if factorizacion is not None:
+                self._bytes -= self._tamano(factorizacion)
+    
+    def __len__(self):
+        return len(self._entradas)
+    
+    def estadisticas(self):
+        """Aciertos, fallos y ocupación de la caché"""
+        return {"aciertos": self.aciertos, "fallos": self.fallos,
+                "entradas": len(self._entradas), "bytes": self._bytes}
+
+
+# Caché compartida por defecto entre las calculadoras y el generador de documentos
+CACHE_FACTORIZACIONES = FactorizationCache()
+
+
+def obtener_factorizacion(matriz, cache=None):
+    """Factorización LU de la matriz usando `cache` (por defecto la compartida)
+    
+    Las matrices diagonales, triangulares, identidad y nulas reciben una
+    StructuredFactorization, sin eliminación.
+    Con cache=False se factoriza siempre sin guardar el resultado.
+    """
+    if cache is False:
+        return factorizar(matriz)
+    # Comparación con None: una FactorizationCache vacía es falsa (define __len__)
+    return (cache if cache is not None else CACHE_FACTORIZACIONES).obtener(matriz)
 
 
 class InverseCalculator:
-    """Clase para calcular la matriz inversa"""
+    """Clase para calcular la matriz inversa
     
-    def __init__(self, matriz):
+    Por defecto usa una única factorización LU para cofactores, adjunta e
+    inversa. Con metodo="menores" se usa la expansión por menores (O(n^5)),
+    útil como modo didáctico, salvo en matrices diagonales o triangulares,
+    que siempre usan su factorización especializada.
+    """
+    
+    def __init__(self, matriz, metodo="lu", cache=None):
+        if metodo not in ("lu", "menores"):
+            raise ValueError(f"Método no soportado: {metodo}")
         self.matriz = np.array(matriz, dtype=float)
         self.n = len(matriz)
+        self.metodo = metodo
+        self.cache = cache
+        self.estructura = detectar_estructura(self.matriz)
+        self.por_factorizacion = metodo == "lu" or self.estructura != "general"
+        self.factorizacion = None
         self.cofactores = None
         self.adjunta = None
         self.inversa = None
+    
+    def obtener_factorizacion(self):
+        """Devuelve la factorización LU, calculándola solo la primera vez"""
+        if self.factorizacion is None:
+            self.factorizacion = obtener_factorizacion(self.matriz, self.cache)
+        return self.factorizacion
         
     def calcular_menor(self, i, j):
         """Calcula el menor de la matriz eliminando fila i y columna j"""
         submatriz = np.delete(np.delete(self.matriz, i, axis=0), j, axis=1)
         return np.linalg.det(submatriz)
     
+    @medido("cofactores", lambda calc, _: {"n": calc.n, "metodo": calc.metodo})
     def calcular_cofactores(self):
         """Calcula la matriz de cofactores"""
+        if self.por_factorizacion:
+            self.cofactores = self.obtener_factorizacion().adjunta().T.copy()
+            return self.cofactores
+        
         self.cofactores = np.zeros((self.n, self.n))
         for i in range(self.n):
             for j in range(self.n):
@@ -138,57 +790,774 @@ class InverseCalculator:
         self.adjunta = self.cofactores.T
         return self.adjunta
     
+    @medido("inversa", lambda calc, _: {"n": calc.n, "metodo": calc.metodo})
     def calcular_inversa(self):
         """Calcula la matriz inversa"""
-        det = np.linalg.det(self.matriz)
+        if self.por_factorizacion:
+            det = self.obtener_factorizacion().determinante()
+        else:
+            det = np.linalg.det(self.matriz)
         if abs(det) < 1e-10:
             raise ValueError("La matriz no tiene inversa (determinante = 0)")
         
         if self.adjunta is None:
             self.calcular_adjunta()
         
-        self.inversa = self.adjunta / det
+        if self.por_factorizacion:
+            self.inversa = self.factorizacion.inversa().copy()
+        else:
+            self.inversa = self.adjunta / det
         return self.inversa
 
 
-class LaTeXDocumentGenerator:
-    """Clase para generar documentos LaTeX con PyLaTeX"""
+class LinearSystemSolver:
+    """Resuelve sistemas A x = b factorizando A una sola vez
+    
+    La factorización es la misma eliminación con pivoteo parcial del método
+    de Gauss (compartida por la caché de factorizaciones) y cada llamada a
+    resolver sustituye a la vez todo un bloque (n, k) de términos
+    independientes. Con registrar_pasos=True se guardan los pasos de la
+    eliminación sobre la matriz aumentada [A | b] del último sistema resuelto.
+    """
+    
+    def __init__(self, matriz, cache=None, registrar_pasos=False):
+        self.matriz = np.array(matriz, dtype=float)
+        if self.matriz.ndim != 2 or self.matriz.shape[0] != self.matriz.shape[1]:
+            raise ValueError("La matriz de coeficientes debe ser cuadrada")
+        self.n = len(self.matriz)
+        self.cache = cache
+        self.registrar_pasos = registrar_pasos
+        self.factorizacion = None
+        self.pasos = None
+        self.solucion = None
+    
+    def obtener_factorizacion(self):
+        """Devuelve la factorización LU, calculándola solo la primera vez"""
+        if self.factorizacion is None:
+            self.factorizacion = obtener_factorizacion(self.matriz, self.cache)
+        return self.factorizacion
+    
+    def validar_terminos(self, b):
+        """Convierte b a float y comprueba que sea un vector (n,) o un bloque (n, k)"""
+        b = np.array(b, dtype=float)
+        if b.ndim not in (1, 2):
+            raise ValueError(f"Los términos independientes deben ser un vector ({self.n},) o un "
+                             f"bloque ({self.n}, k) de columnas, no un arreglo de forma {b.shape}")
+        if len(b) != self.n:
+            raise ValueError(f"Los términos independientes deben tener {self.n} filas")
+        return b
+    
+    @medido("resolucion_sistema", lambda calc, b, _: {"n": calc.n,
+                                                           "k": np.shape(b)[1] if np.ndim(b) == 2 else 1})
+    def resolver(self, b):
+        """Resuelve A x = b; b puede ser un vector (n,) o un bloque (n, k) de columnas"""
+        b = self.validar_terminos(b)
+        
+        f = self.obtener_factorizacion()
+        if self.registrar_pasos:
+            self.pasos = f.registro().sobre(np.column_stack([self.matriz, b]))
+        self.solucion = f.resolver(b)
+        return self.solucion
+
+
+def _paso_gauss_jordan(matriz, r, j, factores):
+    """Aplica en el lugar el paso de Gauss-Jordan con pivote en (r, j)
+    
+    La fila r se divide por el pivote y, de una sola vez, se resta a todas
+    las demás filas su múltiplo (factores[i] = a_ij antes del paso). Las
+    columnas anteriores a j de la fila pivote son nulas, así que solo se
+    actualizan las columnas j en adelante; la columna j queda exactamente
+    como el vector unitario e_r.
+    """
+    matriz[r, j:] /= matriz[r, j]
+    matriz[:, j:] -= np.outer(factores, matriz[r, j:])
+    matriz[:, j] = 0
+    matriz[r, j] = 1
+
+
+@medido("gauss_jordan_bloques", lambda R, *_: {"m": R.shape[0], "n": R.shape[1]})
+def rref_por_bloques(R, tol=1e-10, tamano_bloque=64):
+    """Gauss-Jordan por bloques de columnas sobre R (float64, se modifica en el lugar)
     
-    def __init__(self, titulo="Operaciones con Matrices"):
-        self.doc = Document()
-        self.doc.packages.append(Package('amsmath'))
-        self.doc.packages.append(Package('amssymb'))
-        self.doc.packages.append(Package('babel', options=['spanish']))
-        self.doc.preamble.append(NoEscape(r'\title{' + titulo + '}'))
-        self.doc.preamble.append(NoEscape(r'\author{Sistema de Álgebra Lineal}'))
-        self.doc.preamble.append(NoEscape(r'\date{\today}'))
-        self.doc.append(NoEscape(r'\maketitle'))
+    Los pivotes de cada panel de columnas se eliminan como en el método sin
+    bloques, pero las operaciones de fila del panel se acumulan en una
+    matriz B (m × b) y se aplican al resto de las columnas con un solo
+    producto de matrices, por franjas de filas. Los intercambios se hacen
+    sobre filas completas; en B solo se intercambian las columnas de los
+    pivotes ya usados, como con L en la factorización LU. Devuelve la lista
+    de columnas pivote.
+    """
+    m, n = R.shape
+    pivotes = []
+    r = 0
+    for j0 in range(0, n, tamano_bloque):
+        if r == m:
+            break
+        j1 = min(j0 + tamano_bloque, n)
+        r0 = r
+        # Columnas r0:r0+b de la transformación acumulada del panel; el último
+        # panel no tiene columnas a su derecha y no necesita acumularla
+        acumular = j1 < n
+        if acumular:
+            b = min(j1 - j0, m - r0)
+            B = np.zeros((m, b))
+            B[r0:r0+b] = np.eye(b)
+        
+        for j in range(j0, j1):
+            if r == m:
+                break
+            p = r + int(np.argmax(np.abs(R[r:, j])))
+            if abs(R[p, j]) < tol:
+                continue
+            if p != r:
+                R[[r, p]] = R[[p, r]]
+                if acumular:
+                    B[[r, p], :r-r0] = B[[p, r], :r-r0]
+            factores = R[:, j].copy()
+            factores[r] = 0
+            pivote = R[r, j]
+            R[r, j:j1] /= pivote
+            R[:, j:j1] -= np.outer(factores, R[r, j:j1])
+            if acumular:
+                # Las columnas de B a la derecha de la del pivote siguen siendo unitarias
+                k = r - r0 + 1
+                B[r, :k] /= pivote
+                B[:, :k] -= np.outer(factores, B[r, :k])
+            R[:, j] = 0
+            R[r, j] = 1
+            pivotes.append(j)
+            r += 1
+        
+        if r == r0 or not acumular:
+            continue
+        
+        # Resto de las columnas: R ← R + (B - I) R[pivotes del panel], por franjas de filas
+        k = r - r0
+        B[r0:r, :k] -= np.eye(k)
+        Y = R[r0:r, j1:].copy()
+        for f0 in range(0, m, tamano_bloque):
+            f1 = min(f0 + tamano_bloque, m)
+            R[f0:f1, j1:] += B[f0:f1, :k] @ Y
+    
+    return pivotes
+
+
+class RegistroGaussJordan(RegistroPasos):
+    """Registro compacto de una eliminación de Gauss-Jordan (matrices m×n)
+    
+    Cada paso de pivote normaliza la fila pivote y elimina toda su columna
+    a la vez, así que se registra como un solo paso con el vector de
+    factores de la columna.
+    """
+    
+    def registrar_pivote(self, r, j, factores):
+        """Registra el paso con pivote en la fila r y la columna j"""
+        self.operaciones.append(("pivote", r, j, factores))
+        self._num_pasos += 1
+    
+    def __iter__(self):
+        """Genera los pasos (descripcion, matriz) reconstruyendo cada matriz"""
+        matriz = self.matriz_original.copy()
+        yield ("Matriz original:", matriz.copy())
+        
+        for tipo, r, dato, factores in self.operaciones:
+            if tipo == "intercambio":
+                matriz[[r, dato]] = matriz[[dato, r]]
+                yield (f"Intercambio F{r+1} ↔ F{dato+1}:", matriz.copy())
+            else:
+                pivote = matriz[r, dato]
+                _paso_gauss_jordan(matriz, r, dato, factores)
+                yield (f"Pivote en ({r+1}, {dato+1}): F{r+1} → F{r+1} / ({pivote:.2f}), "
+                       f"Fi → Fi - ai{dato+1}·F{r+1} para i ≠ {r+1}:", matriz.copy())
+
+
+class RREFCalculator:
+    """Forma escalonada reducida, rango y espacio nulo por Gauss-Jordan
+    
+    Acepta matrices m×n. Cada pivote elimina toda su columna con una sola
+    operación de NumPy (pivoteo parcial por columnas). Con trazar=True los
+    pasos se guardan en un RegistroGaussJordan; con trazar=False no se
+    registran pasos y la eliminación se hace por bloques con
+    rref_por_bloques, para matrices grandes.
+    """
+    
+    def __init__(self, matriz, trazar=True, tol=1e-10):
+        self.matriz_original = np.array(matriz, dtype=float)
+        if self.matriz_original.ndim != 2:
+            raise ValueError("Se esperaba una matriz (arreglo de dos dimensiones)")
+        self.m, self.n = self.matriz_original.shape
+        self.trazar = trazar
+        self.tol = tol
+        self.pasos = None
+        self.rref = None
+        self.columnas_pivote = None
+    
+    @medido("eliminacion_gauss_jordan", lambda calc, _: {"m": calc.m, "n": calc.n,
+                                                          "pasos": len(calc.pasos) if calc.trazar else 0})
+    def calcular_rref(self):
+        """Calcula la forma escalonada reducida por filas de la matriz"""
+        if self.rref is not None:
+            return self.rref
+        
+        R = self.matriz_original.copy()
+        if not self.trazar:
+            self.columnas_pivote = rref_por_bloques(R, self.tol)
+            self.rref = R
+            return R
+        
+        registro = RegistroGaussJordan(R)
+        pivotes = []
+        r = 0
+        for j in range(self.n):
+            if r == self.m:
+                break
+            p = r + int(np.argmax(np.abs(R[r:, j])))
+            if abs(R[p, j]) < self.tol:
+                continue
+            if p != r:
+                R[[r, p]] = R[[p, r]]
+                registro.registrar_intercambio(r, p)
+            factores = R[:, j].copy()
+            factores[r] = 0
+            _paso_gauss_jordan(R, r, j, factores)
+            registro.registrar_pivote(r, j, factores)
+            pivotes.append(j)
+            r += 1
+        
+        self.pasos = registro
+        self.columnas_pivote = pivotes
+        self.rref = R
+        return R
+    
+    def calcular_rango(self):
+        """Rango de la matriz: número de columnas pivote"""
+        self.calcular_rref()
+        return len(self.columnas_pivote)
+    
+    def calcular_espacio_nulo(self):
+        """Base del espacio nulo como columnas de una matriz n × (n - rango)
+        
+        Cada columna libre da un vector de la base: 1 en esa variable libre
+        y el opuesto de su columna en la forma reducida en las variables pivote.
+        """
+        R = self.calcular_rref()
+        rango = len(self.columnas_pivote)
+        pivote = set(self.columnas_pivote)
+        libres = [j for j in range(self.n) if j not in pivote]
+        base = np.zeros((self.n, len(libres)))
+        base[self.columnas_pivote] = -R[:rango, libres]
+        base[libres, np.arange(len(libres))] = 1
+        return base
+
+
+def _matriz_entera(matriz):
+    """Convierte una matriz de enteros a un arreglo de objetos con int de Python"""
+    arr = np.asarray(matriz)
+    if arr.dtype == object:
+        if not all(isinstance(x, (int, np.integer)) or
+                   (isinstance(x, Fraction) and x.denominator == 1) for x in arr.flat):
+            raise ValueError("El modo exacto requiere una matriz de enteros")
+    elif not np.issubdtype(arr.dtype, np.integer):
+        if not np.all(np.isfinite(arr)) or not np.all(arr == np.round(arr)):
+            raise ValueError("El modo exacto requiere una matriz de enteros")
+    entera = np.empty(arr.shape, dtype=object)
+    entera.flat[:] = [int(x) for x in arr.flat]
+    return entera
+
+
+def _paso_bareiss(matriz, k, previo, jordan=False):
+    """Aplica en el lugar un paso de Bareiss con pivote en (k, k)
+    
+    Con jordan=True se actualizan también las filas superiores
+    (variante de Gauss-Jordan libre de fracciones).
+    """
+    if jordan:
+        filas = np.array([i for i in range(len(matriz)) if i != k], dtype=np.intp)
+    else:
+        filas = np.arange(k + 1, len(matriz))
+    if len(filas):
+        matriz[filas] = (matriz[k, k] * matriz[filas]
+                         - np.outer(matriz[filas, k], matriz[k])) // previo
+
+
+def _eliminacion_bareiss(matriz, registro=None, jordan=False):
+    """Eliminación de Bareiss sobre una matriz de enteros (modifica `matriz`)
+    
+    Devuelve (signo, pivote_final, completa); `completa` es False si se
+    encontró una columna sin pivote no nulo (matriz singular).
+    """
+    n = len(matriz)
+    signo = 1
+    previo = 1
+    for k in range(n):
+        candidatos = np.flatnonzero(matriz[k:, k] != 0)
+        if not len(candidatos):
+            return signo, 0, False
+        p = k + int(candidatos[0])
+        if p != k:
+            matriz[[k, p]] = matriz[[p, k]]
+            signo = -signo
+            if registro is not None:
+                registro.registrar_intercambio(k, p)
+        if jordan or k < n - 1:
+            _paso_bareiss(matriz, k, previo, jordan)
+            if registro is not None:
+                registro.registrar_bareiss(k, previo, jordan)
+        previo = matriz[k, k]
+    return signo, previo, True
+
+
+class RegistroBareiss(RegistroPasos):
+    """Registro compacto de una eliminación de Bareiss con enteros exactos"""
+    
+    def __init__(self, matriz_original):
+        self.matriz_original = np.array(matriz_original, dtype=object)
+        self.operaciones = []
+        self._num_pasos = 1
+    
+    def registrar_bareiss(self, k, previo, jordan=False):
+        """Registra un paso de Bareiss con pivote en la fila k"""
+        self.operaciones.append(("bareiss", k, previo, jordan))
+        self._num_pasos += 1
+    
+    def __iter__(self):
+        """Genera los pasos (descripcion, matriz) reconstruyendo cada matriz"""
+        matriz = self.matriz_original.copy()
+        yield ("Matriz original:", matriz.copy())
+        
+        for tipo, k, dato, jordan in self.operaciones:
+            if tipo == "intercambio":
+                matriz[[k, dato]] = matriz[[dato, k]]
+                yield (f"Intercambio F{k+1} ↔ F{dato+1}:", matriz.copy())
+            else:
+                pivote = matriz[k, k]
+                _paso_bareiss(matriz, k, dato, jordan)
+                filas = f"i ≠ {k+1}" if jordan else f"i > {k+1}"
+                yield (f"Bareiss, pivote F{k+1}: Fi → ({pivote}·Fi - ai{k+1}·F{k+1}) / {dato}, "
+                       f"para {filas}:", matriz.copy())
+
+
+class BareissCalculator:
+    """Modo exacto para matrices de enteros (eliminación de Bareiss)
+    
+    Todas las operaciones son divisiones exactas entre enteros de Python,
+    por lo que el determinante y la adjunta son exactos y los valores
+    intermedios quedan acotados por menores de la matriz.
+    """
+    
+    def __init__(self, matriz):
+        self.matriz_original = _matriz_entera(matriz)
+        self.matriz = self.matriz_original.copy()
+        self.n = len(self.matriz)
+        self.pasos = RegistroBareiss(self.matriz)
+        self.determinante = None
+        self.cofactores = None
+        self.adjunta = None
+        self.inversa = None
+    
+    @medido("eliminacion_bareiss", lambda calc, _: {"n": calc.n, "pasos": len(calc.pasos)})
+    def calcular_determinante(self):
+        """Calcula el determinante exacto (int) por eliminación de Bareiss"""
+        self.matriz = self.matriz_original.copy()
+        self.pasos = RegistroBareiss(self.matriz)
+        signo, pivote, completa = _eliminacion_bareiss(self.matriz, self.pasos)
+        self.determinante = signo * pivote if completa else 0
+        return self.determinante
+    
+    @medido("cofactores", lambda calc, _: {"n": calc.n, "metodo": "bareiss"})
+    def calcular_adjunta(self):
+        """Calcula la adjunta entera con Gauss-Jordan libre de fracciones sobre [A | I]"""
+        n = self.n
+        aumentada = np.concatenate([self.matriz_original, _matriz_entera(np.eye(n, dtype=int))], axis=1)
+        signo, pivote, completa = _eliminacion_bareiss(aumentada, jordan=True)
+        
+        if completa:
+            # [A | I] → [p·I | p·A⁻¹] con p = det(PA) = signo·det(A)
+            self.determinante = signo * pivote
+            self.adjunta = signo * aumentada[:, n:]
+        else:
+            # Matriz singular: cofactores por menores, cada uno con Bareiss
+            self.determinante = 0
+            self.adjunta = np.empty((n, n), dtype=object)
+            for i in range(n):
+                for j in range(n):
+                    menor = np.delete(np.delete(self.matriz_original, i, axis=0), j, axis=1)
+                    s, p, c = _eliminacion_bareiss(menor)
+                    self.adjunta[j, i] = (-1) ** (i + j) * s * p if c else 0
+        self.cofactores = self.adjunta.T
+        return self.adjunta
+    
+    def calcular_cofactores(self):
+        """Matriz de cofactores exacta (transpuesta de la adjunta)"""
+        if self.adjunta is None:
+            self.calcular_adjunta()
+        return self.cofactores
+    
+    def calcular_inversa(self):
+        """Inversa racional exacta: adj(A)/det(A) con elementos Fraction"""
+        if self.adjunta is None:
+            self.calcular_adjunta()
+        if self.determinante == 0:
+            raise ValueError("La matriz no tiene inversa (determinante = 0)")
+        self.inversa = np.empty((self.n, self.n), dtype=object)
+        self.inversa.flat[:] = [Fraction(x, self.determinante) for x in self.adjunta.flat]
+        return self.inversa
+
+
+class BatchLUFactorization:
+    """Factorización LU con pivoteo parcial de una pila de matrices (k, n, n)
+    
+    Cada columna se elimina a la vez en todas las matrices del lote. Las
+    matrices singulares no detienen el proceso: quedan marcadas en la
+    máscara `singulares`.
+    """
+    
+    def __init__(self, matrices, tol=1e-10, registrar_pasos=False):
+        self.matrices = np.array(matrices, dtype=float)
+        if self.matrices.ndim != 3 or self.matrices.shape[1] != self.matrices.shape[2]:
+            raise ValueError("Se esperaba una pila de matrices cuadradas con forma (k, n, n)")
+        self.k, self.n = self.matrices.shape[:2]
+        self.tol = tol
+        self.registrar_pasos = registrar_pasos
+        self.permutaciones = np.tile(np.arange(self.n), (self.k, 1))
+        self.signos = np.ones(self.k)
+        self.singulares = np.zeros(self.k, dtype=bool)
+        self.pivotes = None
+        self.multiplicadores = None
+        self._inversas = None
+        self._factorizar()
+    
+    @medido("factorizacion_lote", lambda f, _: {"k": f.k, "n": f.n})
+    def _factorizar(self):
+        """Eliminación gaussiana vectorizada sobre todo el lote"""
+        k, n = self.k, self.n
+        lote = np.arange(k)
+        U = self.matrices.copy()
+        L = np.broadcast_to(np.eye(n), (k, n, n)).copy()
+        if self.registrar_pasos:
+            # pivotes[b, i]: fila elegida como pivote en la columna i
+            # multiplicadores[b, i, j]: factor aplicado a la fila j en la columna i
+            self.pivotes = np.zeros((k, n), dtype=np.intp)
+            self.multiplicadores = np.zeros((k, n, n))
+        
+        for i in range(n):
+            max_filas = i + np.argmax(np.abs(U[:, i:, i]), axis=1)
+            if self.registrar_pasos:
+                self.pivotes[:, i] = max_filas
+            
+            intercambio = max_filas != i
+            if intercambio.any():
+                b, m = lote[intercambio], max_filas[intercambio]
+                U[b, i], U[b, m] = U[b, m], U[b, i].copy()
+                L[b, i, :i], L[b, m, :i] = L[b, m, :i], L[b, i, :i].copy()
+                P = self.permutaciones
+                P[b, i], P[b, m] = P[b, m], P[b, i].copy()
+                self.signos[intercambio] *= -1
+            
+            pivote = U[:, i, i]
+            nulo = np.abs(pivote) < self.tol
+            self.singulares |= nulo
+            
+            factores = U[:, i+1:, i] / np.where(nulo, 1.0, pivote)[:, None]
+            factores[nulo] = 0.0
+            L[:, i+1:, i] = factores
+            U[:, i+1:] -= factores[:, :, None] * U[:, i, None, :]
+            if self.registrar_pasos:
+                self.multiplicadores[:, i, i+1:] = factores
+        
+        self.L = L
+        self.U = U
+    
+    def determinantes(self):
+        """Determinantes de todo el lote (0 para las matrices singulares)"""
+        dets = self.signos * np.prod(np.diagonal(self.U, axis1=1, axis2=2), axis=1)
+        dets[self.singulares] = 0.0
+        return dets
+    
+    def inversas(self):
+        """Inversas de todo el lote; las matrices singulares quedan con NaN"""
+        if self._inversas is not None:
+            return self._inversas
+        n = self.n
+        lote = np.arange(self.k)[:, None]
+        Y = np.broadcast_to(np.eye(n), (self.k, n, n))[lote, self.permutaciones]
+        diagonal = np.diagonal(self.U, axis1=1, axis2=2).copy()
+        diagonal[self.singulares] = 1.0
+        
+        for i in range(n):
+            Y[:, i] -= np.einsum('kj,kjc->kc', self.L[:, i, :i], Y[:, :i])
+        for i in range(n - 1, -1, -1):
+            Y[:, i] -= np.einsum('kj,kjc->kc', self.U[:, i, i+1:], Y[:, i+1:])
+            Y[:, i] /= diagonal[:, i, None]
+        
+        Y[self.singulares] = np.nan
+        self._inversas = Y
+        return Y
+    
+    def adjuntas(self):
+        """Adjuntas de todo el lote: det·A⁻¹, o SVD para las singulares"""
+        dets = self.determinantes()
+        adjuntas = dets[:, None, None] * self.inversas()
+        if self.singulares.any():
+            adjuntas[self.singulares] = _adjunta_svd(self.matrices[self.singulares])
+        return adjuntas
+    
+    def registro(self, b):
+        """Registro de pasos de la matriz b del lote, compatible con DeterminantCalculator"""
+        if self.pivotes is None:
+            raise ValueError("El lote se factorizó sin registrar_pasos=True")
+        registro = RegistroPasos(self.matrices[b])
+        for i in range(self.n):
+            if self.pivotes[b, i] != i:
+                registro.registrar_intercambio(i, int(self.pivotes[b, i]))
+            if abs(self.U[b, i, i]) < self.tol:
+                break
+            filas = np.flatnonzero(self.multiplicadores[b, i])
+            if len(filas):
+                registro.registrar_eliminacion(i, filas, self.multiplicadores[b, i, filas])
+        return registro
+
+
+class BatchDeterminantCalculator:
+    """Cálculo de determinantes para una pila (k, n, n) de matrices"""
+    
+    def __init__(self, matrices, registrar_pasos=False):
+        self.factorizacion = BatchLUFactorization(matrices, registrar_pasos=registrar_pasos)
+        self.singulares = self.factorizacion.singulares
+        self.determinantes = None
+    
+    def calcular_determinantes(self):
+        """Calcula los k determinantes en una sola pasada"""
+        self.determinantes = self.factorizacion.determinantes()
+        return self.determinantes
+    
+    def obtener_pasos(self):
+        """Pasos compactos del lote: (pivotes (k, n), multiplicadores (k, n, n))"""
+        return self.factorizacion.pivotes, self.factorizacion.multiplicadores
+    
+    def pasos(self, b):
+        """Pasos (descripcion, matriz) de la matriz b, como en DeterminantCalculator"""
+        return self.factorizacion.registro(b)
+
+
+class BatchInverseCalculator:
+    """Cálculo de cofactores, adjuntas e inversas para una pila (k, n, n)
+    
+    En lugar de lanzar ValueError, las matrices sin inversa se marcan en la
+    máscara `singulares` y su inversa queda llena de NaN.
+    """
+    
+    def __init__(self, matrices, registrar_pasos=False):
+        self.factorizacion = BatchLUFactorization(matrices, registrar_pasos=registrar_pasos)
+        self.singulares = self.factorizacion.singulares
+        self.determinantes = None
+        self.cofactores = None
+        self.adjuntas = None
+        self.inversas = None
+    
+    def calcular_determinantes(self):
+        """Determinantes del lote"""
+        self.determinantes = self.factorizacion.determinantes()
+        return self.determinantes
+    
+    def calcular_cofactores(self):
+        """Matrices de cofactores del lote"""
+        if self.adjuntas is None:
+            self.calcular_adjuntas()
+        self.cofactores = np.swapaxes(self.adjuntas, 1, 2)
+        return self.cofactores
+    
+    def calcular_adjuntas(self):
+        """Matrices adjuntas del lote"""
+        self.adjuntas = self.factorizacion.adjuntas()
+        return self.adjuntas
+    
+    def calcular_inversas(self):
+        """Inversas del lote (NaN en las matrices singulares)"""
+        self.inversas = self.factorizacion.inversas()
+        return self.inversas
+    
+    def calcular_todo(self):
+        """Devuelve un diccionario con todos los resultados del lote"""
+        return {
+            "determinantes": self.calcular_determinantes(),
+            "cofactores": self.calcular_cofactores(),
+            "adjuntas": self.adjuntas,
+            "inversas": self.calcular_inversas(),
+            "singulares": self.singulares,
+        }
+
+
+class LaTeXMatrixFormatter:
+    """Formateador vectorizado de matrices a LaTeX (entorno bmatrix)
+    
+    El formato se decide una sola vez según el dtype de la matriz y cada
+    bloque de filas se formatea con una única operación `%`, en lugar de
+    revisar el tipo de cada elemento.
+    """
+    
+    FILAS_POR_BLOQUE = 256
+    
+    def __init__(self, precision=2, recortar_ceros=True):
+        self.precision = precision
+        self.recortar_ceros = recortar_ceros
+    
+    def formatear(self, matriz):
+        """Devuelve la matriz en LaTeX como una sola cadena"""
+        flujo = io.StringIO()
+        self.escribir(matriz, flujo)
+        return flujo.getvalue()
+    
+    def escribir(self, matriz, flujo):
+        """Escribe la matriz en LaTeX en un archivo o flujo de texto, por bloques de filas"""
+        matriz = np.asarray(matriz)
+        if matriz.ndim == 1:
+            matriz = matriz.reshape(1, -1)
+        filas, cols = matriz.shape
+        
+        flujo.write(r"\begin{bmatrix}" + "\n")
+        for inicio in range(0, filas, self.FILAS_POR_BLOQUE):
+            if inicio:
+                flujo.write(r" \\" + "\n")
+            flujo.write(self._formatear_filas(matriz[inicio:inicio + self.FILAS_POR_BLOQUE], cols))
+        flujo.write("\n" + r"\end{bmatrix}")
+    
+    def _formatear_filas(self, bloque, cols):
+        """Formatea un bloque de filas según su dtype"""
+        if bloque.dtype.kind == 'f':
+            if self.recortar_ceros:
+                # Valores que se redondearían a -0.00 se escriben como 0.00
+                bloque = np.where(np.abs(bloque) < 0.5 * 10.0 ** -self.precision, 0.0, bloque)
+            celda = f"%.{self.precision}f"
+        elif bloque.dtype.kind in 'iu':
+            celda = "%d"
+        else:
+            return r" \\" "\n".join(" & ".join(self._formatear_celda(x) for x in fila)
+                                     for fila in bloque)
+        
+        plantilla = r" \\" "\n".join([" & ".join([celda] * cols)] * len(bloque))
+        return plantilla % tuple(bloque.ravel().tolist())
+    
+    def _formatear_celda(self, valor):
+        """Formato de un elemento suelto (matrices de tipo object)"""
+        if isinstance(valor, Fraction):
+            return self._fraccion_to_latex(valor)
+        if isinstance(valor, float):
+            if self.recortar_ceros and abs(valor) < 0.5 * 10.0 ** -self.precision:
+                valor = 0.0
+            return f"{valor:.{self.precision}f}"
+        return str(valor)
+    
+    @staticmethod
+    def _fraccion_to_latex(valor):
+        """Convierte una fracción exacta a LaTeX (entero si el denominador es 1)"""
+        if valor.denominator == 1:
+            return str(valor.numerator)
+        signo = "-" if valor < 0 else ""
+        return signo + r"\frac{" + str(abs(valor.numerator)) + "}{" + str(valor.denominator) + "}"
+
+
+def recortar_pasos(pasos, primeros, ultimos):
+    """Generador con los primeros y los últimos pasos de un registro
+    
+    Los pasos intermedios se reemplazan por un único paso (descripcion, None)
+    que indica cuántos se omitieron. Solo se guardan en memoria los últimos
+    `ultimos` pasos, así que sirve para registros de cualquier tamaño.
+    """
+    iterador = iter(pasos)
+    yield from itertools.islice(iterador, primeros)
+    finales = deque(maxlen=ultimos)
+    omitidos = 0
+    for paso in iterador:
+        if len(finales) == ultimos:
+            omitidos += 1
+        finales.append(paso)
+    if omitidos:
+        yield (f"(Se omiten {omitidos} pasos intermedios)", None)
+    yield from finales
+
+
+class BaseDocumentGenerator(ABC):
+    """Contenido común de los documentos (tipos, determinante, inversa, sistemas)
+    
+    Las subclases deciden el formato de salida implementando las primitivas
+    abstractas _seccion, _subseccion, _texto, _negrita, _formula_en_linea y
+    _ecuacion (si falta alguna, la subclase no se puede instanciar); las
+    matrices siempre se escriben en LaTeX con LaTeXMatrixFormatter.
+    
+    Con politica_pasos=(primeros, ultimos) (o un entero N para ambos) las
+    eliminaciones largas solo muestran sus primeros y últimos pasos.
+    """
+    
+    def __init__(self, precision=2, recortar_ceros=True, politica_pasos=None):
+        self.formateador = LaTeXMatrixFormatter(precision, recortar_ceros)
+        if isinstance(politica_pasos, int):
+            politica_pasos = (politica_pasos, politica_pasos)
+        self.politica_pasos = politica_pasos
+    
+    @abstractmethod
+    def _seccion(self, titulo):
+        """Context manager de una sección"""
+    
+    @abstractmethod
+    def _subseccion(self, titulo):
+        """Context manager de una subsección"""
+    
+    @abstractmethod
+    def _texto(self, texto):
+        """Texto normal (se escapa según el formato)"""
+    
+    @abstractmethod
+    def _negrita(self, texto):
+        """Texto en negrita"""
+    
+    @abstractmethod
+    def _formula_en_linea(self, formula, etiqueta="", negrita=False):
+        """Etiqueta (opcionalmente en negrita) seguida de una fórmula en línea"""
+    
+    @abstractmethod
+    def _ecuacion(self, latex):
+        """Fórmula en modo display"""
+    
+    def _ecuacion_matriz(self, matriz):
+        """Matriz en modo display"""
+        self._ecuacion(self._matriz_to_latex(matriz))
+    
+    def _escribir_pasos(self, pasos):
+        """Escribe los pasos (descripcion, matriz) de una eliminación según politica_pasos"""
+        if self.politica_pasos is not None:
+            pasos = recortar_pasos(pasos, *self.politica_pasos)
+        for descripcion, mat in pasos:
+            if mat is None:
+                self._texto(descripcion + "\n\n")
+                continue
+            self._negrita(descripcion)
+            self._ecuacion_matriz(mat)
+            self._texto("\n\n")
     
     def agregar_matriz(self, matriz, titulo="Matriz"):
         """Agrega una matriz al documento"""
-        with self.doc.create(Subsection(titulo)):
-            with self.doc.create(Math(data=None)):
-                mat_str = self._matriz_to_latex(matriz)
-                self.doc.append(NoEscape(mat_str))
+        with self._subseccion(titulo):
+            self._ecuacion_matriz(matriz)
     
     def _matriz_to_latex(self, matriz):
         """Convierte una matriz numpy a formato LaTeX"""
-        filas = matriz.shape[0]
-        cols = matriz.shape[1]
-        
-        latex_str = r"\begin{bmatrix}" + "\n"
-        for i in range(filas):
-            fila = " & ".join([f"{matriz[i][j]:.2f}" if isinstance(matriz[i][j], float) 
-                              else str(matriz[i][j]) for j in range(cols)])
-            latex_str += fila
-            if i < filas - 1:
-                latex_str += r" \\" + "\n"
-        latex_str += "\n" + r"\end{bmatrix}"
-        return latex_str
-    
-    def documento_tipos_matrices(self):
-        """Genera un documento con todos los tipos de matrices"""
-        with self.doc.create(Section('Tipos de Matrices Aleatorias')):
+        return self.formateador.formatear(matriz)
+    
+    @medido("construccion_documento", lambda *_: {"seccion": "tipos"})
+    def documento_tipos_matrices(self, semilla=None):
+        """Genera un documento con todos los tipos de matrices
+        
+        Con una semilla se usa un generador propio y el documento es reproducible.
+        """
+        with self._seccion('Tipos de Matrices Aleatorias'):
+            
+            if semilla is not None:
+                gen = MatrixGenerator(semilla)
+                for tipo, (m, n) in MatrixGenerator.TIPOS.items():
+                    nombre = tipo.replace("_", " ").title()
+                    self.agregar_matriz(gen.generar(tipo), f"Matriz {nombre} ({m}x{n})")
+                return
             
             gen = MatrixGenerator()
             
@@ -202,28 +1571,43 @@ class LaTeXDocumentGenerator:
             self.agregar_matriz(gen.matriz_identidad(), "Matriz Identidad (4x4)")
             self.agregar_matriz(gen.matriz_nula(), "Matriz Nula (3x3)")
     
-    def documento_determinante(self, matriz):
-        """Genera un documento mostrando el cálculo del determinante"""
-        with self.doc.create(Section('Cálculo de Determinante - Método de Gauss')):
+    @medido("construccion_documento", lambda *_: {"seccion": "determinante"})
+    def documento_determinante(self, matriz, exacto=False):
+        """Genera un documento mostrando el cálculo del determinante
+        
+        Con exacto=True se usa la eliminación de Bareiss con enteros exactos.
+        Devuelve el determinante calculado.
+        """
+        titulo = 'Cálculo de Determinante - Método de Bareiss (exacto)' if exacto \
+            else 'Cálculo de Determinante - Método de Gauss'
+        with self._seccion(titulo):
             
-            calc = DeterminantCalculator(matriz)
+            calc = BareissCalculator(matriz) if exacto else DeterminantCalculator(matriz)
             det = calc.calcular_determinante()
             
-            self.doc.append("A continuación se muestra el proceso paso a paso:\n\n")
+            if not exacto and calc.estructura != "general":
+                self._texto(f"La matriz es {ESTRUCTURAS[calc.estructura]}: su determinante es "
+                            "el producto de los elementos de la diagonal, sin eliminación.\n\n")
+            
+            self._texto("A continuación se muestra el proceso paso a paso:\n\n")
             
-            for descripcion, mat in calc.pasos:
-                self.doc.append(NoEscape(r'\textbf{' + descripcion + r'}'))
-                with self.doc.create(Math(data=None)):
-                    self.doc.append(NoEscape(self._matriz_to_latex(mat)))
-                self.doc.append("\n\n")
+            self._escribir_pasos(calc.pasos)
             
-            self.doc.append(NoEscape(r'\textbf{Determinante final: } $\det(A) = ' + f'{det:.4f}' + r'$'))
+            det_str = str(det) if exacto else f'{det:.4f}'
+            self._formula_en_linea(r'\det(A) = ' + det_str, 'Determinante final: ', negrita=True)
+        
+        return det
     
-    def documento_inversa(self, matriz):
-        """Genera un documento mostrando el cálculo de la matriz inversa"""
-        with self.doc.create(Section('Cálculo de Matriz Inversa')):
+    @medido("construccion_documento", lambda *_: {"seccion": "inversa"})
+    def documento_inversa(self, matriz, exacto=False):
+        """Genera un documento mostrando el cálculo de la matriz inversa
+        
+        Con exacto=True la adjunta es entera y la inversa racional (Bareiss).
+        Devuelve la inversa, o None si la matriz no tiene inversa.
+        """
+        with self._seccion('Cálculo de Matriz Inversa'):
             
-            calc = InverseCalculator(matriz)
+            calc = BareissCalculator(matriz) if exacto else InverseCalculator(matriz)
             
             self.agregar_matriz(matriz, "Matriz Original A")
             
@@ -233,30 +1617,324 @@ class LaTeXDocumentGenerator:
             adjunta = calc.calcular_adjunta()
             self.agregar_matriz(adjunta, "Matriz Adjunta (Transpuesta de Cofactores)")
             
-            det = np.linalg.det(matriz)
-            self.doc.append(NoEscape(r'\textbf{Determinante: } $\det(A) = ' + f'{det:.4f}' + r'$'))
-            self.doc.append("\n\n")
+            # El determinante sale de la misma factorización (o eliminación exacta)
+            if exacto:
+                det_str = str(calc.determinante)
+            else:
+                det_str = f'{calc.obtener_factorizacion().determinante():.4f}'
+            self._formula_en_linea(r'\det(A) = ' + det_str, 'Determinante: ', negrita=True)
+            self._texto("\n\n")
             
             try:
                 inversa = calc.calcular_inversa()
-                self.doc.append(NoEscape(r'La matriz inversa se calcula como: $A^{-1} = \frac{1}{\det(A)} \cdot \text{Adj}(A)$'))
-                self.doc.append("\n\n")
+                self._formula_en_linea(r'A^{-1} = \frac{1}{\det(A)} \cdot \text{Adj}(A)',
+                                       'La matriz inversa se calcula como: ')
+                self._texto("\n\n")
+                if not exacto and calc.estructura in ("diagonal", "identidad"):
+                    self._texto("Al ser diagonal, basta con invertir cada elemento de la diagonal.\n\n")
+                elif not exacto and calc.estructura != "general":
+                    self._texto(f"Al ser {ESTRUCTURAS[calc.estructura]}, la inversa se obtiene "
+                                "por sustitución.\n\n")
                 self.agregar_matriz(inversa, "Matriz Inversa A⁻¹")
                 
                 # Verificación
-                producto = np.dot(matriz, inversa)
+                producto = np.dot(calc.matriz_original if exacto else matriz, inversa)
                 self.agregar_matriz(producto, "Verificación: A × A⁻¹ (debe ser I)")
                 
             except ValueError as e:
-                self.doc.append(str(e))
+                self._texto(str(e))
+                return None
+        
+        return inversa
+    
+    @medido("construccion_documento", lambda *_: {"seccion": "sistema"})
+    def documento_sistema(self, matriz, b):
+        """Genera un documento mostrando la resolución del sistema A x = b
+        
+        La eliminación se muestra sobre la matriz aumentada [A | b]; b puede
+        tener varias columnas. Devuelve la solución, o None si A es singular.
+        Si b no tiene tantas filas como A se lanza ValueError antes de escribir nada.
+        """
+        solver = LinearSystemSolver(matriz, registrar_pasos=True)
+        solver.validar_terminos(b)
+        b = np.asarray(b)
+        
+        with self._seccion('Resolución de Sistema Lineal - Método de Gauss'):
+            
+            columna = b.reshape(-1, 1) if b.ndim == 1 else b
+            
+            self.agregar_matriz(matriz, "Matriz de Coeficientes A")
+            self.agregar_matriz(columna, "Términos Independientes b")
+            
+            try:
+                x = solver.resolver(b)
+            except ValueError as e:
+                x = None
+                error = str(e)
+            
+            self._formula_en_linea(r'[A \mid b]', 'Eliminación paso a paso sobre la matriz aumentada ')
+            self._texto("\n\n")
+            
+            self._escribir_pasos(solver.pasos)
+            
+            if x is None:
+                self._texto(error)
+                return None
+            
+            metodo = SUSTITUCIONES[solver.obtener_factorizacion().estructura]
+            self._texto(f"La solución se obtiene {metodo}.\n\n")
+            self.agregar_matriz(x.reshape(-1, 1) if x.ndim == 1 else x, "Solución x")
+            
+            # Verificación
+            producto = np.dot(matriz, x)
+            self.agregar_matriz(producto.reshape(-1, 1) if producto.ndim == 1 else producto,
+                                "Verificación: A × x (debe ser b)")
+        
+        return x
+
+    @medido("construccion_documento", lambda *_: {"seccion": "rref"})
+    def documento_rref(self, matriz):
+        """Genera un documento con la forma escalonada reducida, el rango y el espacio nulo
+        
+        La matriz puede ser rectangular (m×n). Devuelve la forma reducida R.
+        """
+        with self._seccion('Forma Escalonada Reducida - Método de Gauss-Jordan'):
+            
+            calc = RREFCalculator(matriz)
+            R = calc.calcular_rref()
+            
+            self.agregar_matriz(matriz, f"Matriz Original A ({calc.m}x{calc.n})")
+            
+            self._texto("A continuación se muestra el proceso paso a paso:\n\n")
+            
+            self._escribir_pasos(calc.pasos)
+            
+            self.agregar_matriz(R, "Forma Escalonada Reducida R")
+            
+            rango = calc.calcular_rango()
+            self._formula_en_linea(r'\operatorname{rang}(A) = ' + str(rango), 'Rango: ', negrita=True)
+            self._texto("\n\n")
+            if rango:
+                columnas = ", ".join(str(j + 1) for j in calc.columnas_pivote)
+                self._texto(f"Columnas pivote: {columnas}\n\n")
+            
+            if rango == calc.n:
+                self._formula_en_linea(r'N(A) = \{ \mathbf{0} \}',
+                                       'Las columnas son linealmente independientes: ')
+                self._texto("\n\n")
+            else:
+                self.agregar_matriz(calc.calcular_espacio_nulo(),
+                                    "Base del Espacio Nulo N(A) (una columna por variable libre)")
+        
+        return R
+
+
+class LaTeXDocumentGenerator(BaseDocumentGenerator):
+    """Clase para generar documentos LaTeX con PyLaTeX
+    
+    PyLaTeX se importa al crear la primera instancia, no al importar el módulo.
+    """
+    
+    def __init__(self, titulo="Operaciones con Matrices", precision=2, recortar_ceros=True,
+                 politica_pasos=None):
+        super().__init__(precision, recortar_ceros, politica_pasos)
+        self.pylatex = pl = _cargar_pylatex()
+        self.doc = pl.Document()
+        self.doc.packages.append(pl.Package('amsmath'))
+        self.doc.packages.append(pl.Package('amssymb'))
+        self.doc.packages.append(pl.Package('babel', options=['spanish']))
+        self.doc.preamble.append(pl.NoEscape(r'\title{' + titulo + '}'))
+        self.doc.preamble.append(pl.NoEscape(r'\author{Sistema de Álgebra Lineal}'))
+        self.doc.preamble.append(pl.NoEscape(r'\date{\today}'))
+        self.doc.append(pl.NoEscape(r'\maketitle'))
+    
+    def _seccion(self, titulo):
+        return self.doc.create(self.pylatex.Section(titulo))
+    
+    def _subseccion(self, titulo):
+        return self.doc.create(self.pylatex.Subsection(titulo))
     
-    def generar_pdf(self, nombre_archivo="output"):
-        """Genera el archivo PDF"""
-        self.doc.generate_pdf(nombre_archivo, clean_tex=False)
+    def _texto(self, texto):
+        self.doc.append(texto)
+    
+    def _negrita(self, texto):
+        self.doc.append(self.pylatex.NoEscape(r'\textbf{' + texto + r'}'))
+    
+    def _formula_en_linea(self, formula, etiqueta="", negrita=False):
+        if negrita:
+            etiqueta = r'\textbf{' + etiqueta + r'} '
+        self.doc.append(self.pylatex.NoEscape(etiqueta + '$' + formula + '$'))
+    
+    def _ecuacion(self, latex):
+        with self.doc.create(self.pylatex.Math(data=None)):
+            self.doc.append(self.pylatex.NoEscape(latex))
+    
+    def generar_pdf(self, nombre_archivo="output", cache=None, clean_tex=False, formato=None):
+        """Genera el archivo PDF
+        
+        Con una CachePDF (módulo compilacion_pdf) se reutiliza el PDF de un
+        documento idéntico ya compilado en lugar de ejecutar LaTeX de nuevo;
+        con un FormatoPreambulo se compila contra el preámbulo precompilado.
+        """
+        from compilacion_pdf import compilar_tex
+        
+        with tramo("volcado_tex") as t:
+            tex = self.doc.dumps()
+            t.anotar(bytes_tex=len(tex.encode("utf-8")))
+        compilar_tex(tex, nombre_archivo, conservar_tex=not clean_tex,
+                     cache=cache, formato=formato)
+    
+    def generar_tex(self, nombre_archivo="output"):
+        """Escribe el documento en nombre_archivo + .tex y devuelve la ruta"""
+        with tramo("volcado_tex") as t:
+            self.doc.generate_tex(nombre_archivo)
+            ruta = nombre_archivo + ".tex"
+            t.anotar(bytes_tex=os.path.getsize(ruta))
+        return ruta
+
+
+
+# Preámbulo por defecto de PyLaTeX más los paquetes de LaTeXDocumentGenerator,
+# para que ambos compartan el mismo formato precompilado
+PREAMBULO_LATEX = r"""\documentclass{article}%
+\usepackage[T1]{fontenc}%
+\usepackage[utf8]{inputenc}%
+\usepackage{lmodern}%
+\usepackage{textcomp}%
+\usepackage{lastpage}%
+\usepackage{amsmath}%
+\usepackage{amssymb}%
+\usepackage[spanish]{babel}%
+%
+\title{TITULO}%
+\author{Sistema de Álgebra Lineal}%
+\date{\today}%
+%
+\begin{document}%
+\normalsize%
+\maketitle%
+"""
+
+# Mismos reemplazos que pylatex.utils.escape_latex
+_ESCAPES_LATEX = str.maketrans({
+    "&": r"\&", "%": r"\%", "$": r"\$", "#": r"\#", "_": r"\_", "{": r"\{", "}": r"\}",
+    "~": r"\textasciitilde{}", "^": r"\^{}", "\\": r"\textbackslash{}", "\n": "\\newline%\n",
+    "-": "{-}", "\xa0": "~", "[": "{[}", "]": "{]}",
+})
+
+
+class StreamingLaTeXDocumentGenerator(BaseDocumentGenerator):
+    """Escribe el documento LaTeX directamente en un archivo, sin PyLaTeX
+    
+    El preámbulo se escribe al abrir el archivo y cada sección, texto y
+    matriz en cuanto se genera; los registros de pasos se consumen como
+    generadores y las matrices se vuelcan con LaTeXMatrixFormatter.escribir.
+    La memoria no crece con el tamaño del informe. Se usa como context
+    manager (o llamando a cerrar) para escribir \\end{document}.
+    """
+    
+    def __init__(self, nombre_archivo, titulo="Operaciones con Matrices", precision=2,
+                 recortar_ceros=True, politica_pasos=None):
+        super().__init__(precision, recortar_ceros, politica_pasos)
+        if not nombre_archivo.endswith(".tex"):
+            nombre_archivo += ".tex"
+        self.ruta = os.path.abspath(nombre_archivo)
+        self.titulo = titulo
+        self.archivo = None
+        self.cerrado = False
+    
+    def __enter__(self):
+        self._abrir()
+        return self
+    
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
+    
+    def _abrir(self):
+        if self.cerrado:
+            raise ValueError("El documento ya se cerró")
+        if self.archivo is None:
+            self.archivo = open(self.ruta, "w", encoding="utf-8")
+            self.archivo.write(PREAMBULO_LATEX.replace("TITULO", self.titulo))
+        return self.archivo
+    
+    def _escribir(self, texto):
+        (self.archivo or self._abrir()).write(texto)
+    
+    def cerrar(self):
+        """Termina el documento y cierra el archivo
+        
+        El tramo volcado_tex mide solo el cierre (el resto se escribió junto
+        con los cálculos) y anota en bytes_tex el tamaño total del archivo.
+        """
+        if self.cerrado:
+            return
+        with tramo("volcado_tex", flujo=True) as t:
+            self._abrir()
+            self.archivo.write("\n\\end{document}\n")
+            self.archivo.close()
+            t.anotar(bytes_tex=os.path.getsize(self.ruta))
+        self.archivo = None
+        self.cerrado = True
+    
+    @contextlib.contextmanager
+    def _seccion(self, titulo):
+        self._escribir(r'\section{' + titulo.translate(_ESCAPES_LATEX) + '}%\n')
+        yield
+        # Línea en blanco al cerrar, como PyLaTeX: termina el párrafo
+        self._escribir('\n')
+    
+    @contextlib.contextmanager
+    def _subseccion(self, titulo):
+        self._escribir(r'\subsection{' + titulo.translate(_ESCAPES_LATEX) + '}%\n')
+        yield
+        self._escribir('\n')
+    
+    def _texto(self, texto):
+        self._escribir(texto.translate(_ESCAPES_LATEX) + '%\n')
+    
+    def _negrita(self, texto):
+        self._escribir(r'\textbf{' + texto + '}%\n')
+    
+    def _formula_en_linea(self, formula, etiqueta="", negrita=False):
+        if negrita:
+            etiqueta = r'\textbf{' + etiqueta + r'} '
+        self._escribir(etiqueta + '$' + formula + '$%\n')
+    
+    def _ecuacion(self, latex):
+        self._escribir('\\[%\n' + latex + '%\n\\]%\n')
+    
+    def _ecuacion_matriz(self, matriz):
+        archivo = self.archivo or self._abrir()
+        archivo.write('\\[%\n')
+        self.formateador.escribir(matriz, archivo)
+        archivo.write('%\n\\]%\n')
+    
+    def dumps(self):
+        """Cierra el documento y devuelve su código LaTeX (leído del archivo)"""
+        self.cerrar()
+        with open(self.ruta, encoding="utf-8") as archivo:
+            return archivo.read()
+    
+    def generar_pdf(self, nombre_archivo=None, cache=None, formato=None):
+        """Cierra el documento y lo compila; por defecto el PDF queda junto al .tex
+        
+        Se compila a partir de la ruta del .tex, que compilar_tex hashea y
+        copia por bloques sin cargar el documento en memoria.
+        """
+        from compilacion_pdf import compilar_tex
+        
+        self.cerrar()
+        destino = os.path.abspath(nombre_archivo or self.ruta[:-len(".tex")])
+        return compilar_tex(pathlib.Path(self.ruta), destino,
+                            conservar_tex=destino + ".tex" != self.ruta, cache=cache, formato=formato)
 
 
 # Ejemplo de uso
 if __name__ == "__main__":
+    from compilacion_pdf import compilar_lote
+    
     print("Sistema de Álgebra Lineal con PyLaTeX")
     print("=" * 50)
     
@@ -264,23 +1942,31 @@ if __name__ == "__main__":
     print("\n1. Generando documento con tipos de matrices...")
     doc1 = LaTeXDocumentGenerator("Tipos de Matrices Aleatorias")
     doc1.documento_tipos_matrices()
-    doc1.generar_pdf("tipos_matrices")
-    print("✓ Documento generado: tipos_matrices.pdf")
     
     # 2. Documento con cálculo de determinante
     print("\n2. Generando documento con cálculo de determinante...")
     matriz_det = np.array([[4, 3, 2], [1, 5, 7], [2, 8, 3]])
     doc2 = LaTeXDocumentGenerator("Cálculo de Determinante")
     doc2.documento_determinante(matriz_det)
-    doc2.generar_pdf("calculo_determinante")
-    print("✓ Documento generado: calculo_determinante.pdf")
     
     # 3. Documento con cálculo de matriz inversa
     print("\n3. Generando documento con cálculo de matriz inversa...")
     matriz_inv = np.array([[4, 7], [2, 6]])
     doc3 = LaTeXDocumentGenerator("Cálculo de Matriz Inversa")
     doc3.documento_inversa(matriz_inv)
-    doc3.generar_pdf("calculo_inversa")
-    print("✓ Documento generado: calculo_inversa.pdf")
     
-    print("\n¡Todos los documentos han sido generados exitosamente!")
+    # Compilación en paralelo de los tres documentos
+    print("\nCompilando documentos en paralelo...")
+    resultados = compilar_lote([
+        ("tipos_matrices", doc1),
+        ("calculo_determinante", doc2),
+        ("calculo_inversa", doc3),
+    ])
+    for r in resultados:
+        if r["ok"]:
+            print(f"✓ Documento generado: {r['nombre']}.pdf")
+        else:
+            print(f"⚠ Error en {r['nombre']}.pdf: {r['error']}")
+    
+    if all(r["ok"] for r in resultados):
+        print("\n¡Todos los documentos han sido generados exitosamente!")
@@ -0,0 +1,283 @@
+"""
+Procesamiento por lotes sin interacción
+Lee un archivo de trabajos (JSONL, .npy o .npz), calcula en paralelo,
+escribe un documento con nombre único por trabajo (.tex, o una vista previa
+HTML/Markdown con --formato) e imprime un resumen JSON
+
+Formato JSONL (una línea por trabajo):
+    {"id": "m1", "operaciones": ["determinante", "inversa"], "matriz": [[4, 7], [2, 6]]}
+Campos opcionales: "exacto" (bool), "titulo" (str), "semilla" (int, para "tipos")
+y "b" (vector o columnas de términos independientes, obligatorio para "sistema").
+En los archivos .npy (una matriz o una pila (k, n, n)) y .npz (una matriz por
+clave) las operaciones se indican con --operaciones.
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from matrix_operations import LaTeXDocumentGenerator
+from vista_previa import FORMATOS, PreviewDocumentGenerator
+
+
+OPERACIONES = ("tipos", "determinante", "inversa", "sistema")
+
+TITULOS = {
+    "tipos": "Tipos de Matrices Aleatorias",
+    "determinante": "Cálculo de Determinante",
+    "inversa": "Cálculo de Matriz Inversa",
+    "sistema": "Resolución de Sistema Lineal",
+}
+
+
+def _trabajo(identificador, operacion, matriz=None, exacto=False, titulo=None, semilla=None,
+             b=None):
+    """Crea el diccionario que describe un trabajo"""
+    if operacion not in OPERACIONES:
+        raise ValueError(f"Operación no soportada en el trabajo {identificador}: {operacion}")
+    if operacion != "tipos" and matriz is None:
+        raise ValueError(f"El trabajo {identificador} no tiene matriz")
+    if operacion == "sistema" and b is None:
+        raise ValueError(f"El trabajo {identificador} no tiene términos independientes (b)")
+    return {"id": str(identificador), "operacion": operacion, "matriz": matriz,
+            "exacto": exacto, "titulo": titulo, "semilla": semilla, "b": b}
+
+
+def _trabajo_invalido(identificador, numero, error):
+    """Trabajo que no se pudo leer; se informa como fallido en el resumen"""
+    return {"id": str(identificador), "operacion": None, "linea": numero,
+            "error": f"{type(error).__name__}: {error}"}
+
+
+def trabajos_desde_json(datos, numero=1, operaciones=("determinante",), exacto=False):
+    """Trabajos (uno por operación) descritos por el objeto JSON de una línea"""
+    identificador = datos.get("id", f"{numero:05d}")
+    ops = datos.get("operaciones") or [datos.get("operacion", operaciones[0])]
+    if isinstance(ops, str):
+        ops = [ops]
+    if not isinstance(ops, list) or not all(isinstance(op, str) for op in ops):
+        raise ValueError(f"Las operaciones del trabajo {identificador} deben ser un texto "
+                         "o una lista de textos")
+    return [_trabajo(identificador, operacion, datos.get("matriz"),
+                     datos.get("exacto", exacto), datos.get("titulo"), datos.get("semilla"),
+                     datos.get("b"))
+            for operacion in ops]
+
+
+def leer_trabajos(ruta, operaciones=("determinante",), exacto=False):
+    """Lee un archivo de trabajos y devuelve la lista de trabajos (uno por operación)
+
+    Una línea JSONL que no se puede leer o validar no detiene la lectura: se
+    devuelve como un trabajo inválido (con su línea y el error) que aparece
+    como fallido en el resumen.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    trabajos = []
+
+    if extension in (".jsonl", ".json"):
+        with open(ruta, encoding="utf-8") as archivo:
+            for numero, linea in enumerate(archivo, start=1):
+                if not linea.strip():
+                    continue
+                datos = None
+                try:
+                    datos = json.loads(linea)
+                    trabajos.extend(trabajos_desde_json(datos, numero, operaciones, exacto))
+                except (ValueError, TypeError, AttributeError) as e:
+                    identificador = datos.get("id", f"{numero:05d}") \
+                        if isinstance(datos, dict) else f"{numero:05d}"
+                    trabajos.append(_trabajo_invalido(identificador, numero, e))
+    elif extension == ".npy":
+        matrices = np.load(ruta, mmap_mode="r")
+        if matrices.ndim == 2:
+            matrices = matrices[None]
+        for indice in range(len(matrices)):
+            for operacion in operaciones:
+                trabajos.append(_trabajo(f"{indice:05d}", operacion,
+                                         np.array(matrices[indice]), exacto))
+    elif extension == ".npz":
+        with np.load(ruta) as datos:
+            for clave in datos.files:
+                for operacion in operaciones:
+                    trabajos.append(_trabajo(clave, operacion, datos[clave], exacto))
+    else:
+        raise ValueError(f"Formato de archivo de trabajos no soportado: {extension}")
+    return trabajos
+
+
+def nombre_archivo(trabajo, prefijo=""):
+    """Nombre de archivo (sin extensión) seguro para un trabajo"""
+    return re.sub(r"[^\w.-]", "_", f"{prefijo}{trabajo['id']}_{trabajo['operacion']}")
+
+
+def _nombres_unicos(trabajos, prefijo=""):
+    """Asigna a cada trabajo un nombre de archivo único"""
+    usados = set()
+    for trabajo in trabajos:
+        base = nombre_archivo(trabajo, prefijo)
+        nombre, copia = base, 1
+        while nombre in usados:
+            copia += 1
+            nombre = f"{base}_{copia}"
+        usados.add(nombre)
+        trabajo["nombre"] = nombre
+
+
+def procesar_trabajo(trabajo, directorio, formato_salida="tex"):
+    """Calcula un trabajo y escribe su documento; devuelve el resultado sin lanzar excepciones
+
+    Con formato_salida "html" o "markdown" se escribe una vista previa en lugar del .tex.
+    """
+    inicio = time.perf_counter()
+    resultado = {"id": trabajo["id"], "operacion": trabajo["operacion"], "ok": False,
+                 "tex": None, "error": None}
+    if trabajo.get("error"):
+        resultado["linea"] = trabajo["linea"]
+        resultado["error"] = trabajo["error"]
+        resultado["segundos"] = 0.0
+        return resultado
+    try:
+        operacion = trabajo["operacion"]
+        if operacion != "tipos":
+            forma = np.shape(trabajo["matriz"])
+            if len(forma) != 2 or forma[0] != forma[1]:
+                raise ValueError(f"Se esperaba una matriz cuadrada y se recibió la forma {forma}")
+        titulo = trabajo["titulo"] or TITULOS[operacion]
+        if formato_salida == "tex":
+            doc = LaTeXDocumentGenerator(titulo)
+        else:
+            doc = PreviewDocumentGenerator(titulo, formato_salida)
+        if operacion == "tipos":
+            doc.documento_tipos_matrices(trabajo["semilla"])
+        elif operacion == "sistema":
+            solucion = doc.documento_sistema(trabajo["matriz"], trabajo["b"])
+            resultado["singular"] = solucion is None
+            resultado["solucion"] = None if solucion is None else solucion.tolist()
+        elif operacion == "determinante":
+            det = doc.documento_determinante(trabajo["matriz"], exacto=trabajo["exacto"])
+            resultado["determinante"] = int(det) if trabajo["exacto"] else float(det)
+        else:
+            inversa = doc.documento_inversa(trabajo["matriz"], exacto=trabajo["exacto"])
+            resultado["singular"] = inversa is None
+
+        ruta = os.path.join(os.path.abspath(directorio), trabajo["nombre"])
+        if formato_salida == "tex":
+            resultado["tex"] = doc.generar_tex(ruta)
+        else:
+            resultado["vista_previa"] = doc.guardar(ruta)
+        resultado["ok"] = True
+    except Exception as e:
+        resultado["error"] = f"{type(e).__name__}: {e}"
+    resultado["segundos"] = time.perf_counter() - inicio
+    return resultado
+
+
+def _procesar_bloque(argumentos):
+    bloque, directorio, formato_salida = argumentos
+    return [procesar_trabajo(trabajo, directorio, formato_salida) for trabajo in bloque]
+
+
+def procesar_lote(trabajos, directorio="salida_lotes", procesos=None, pdf=False, prefijo="",
+                  formato_salida="tex", **opciones_pdf):
+    """Procesa todos los trabajos en paralelo y devuelve el resumen como diccionario
+
+    formato_salida es el tipo de documento ("tex", "html" o "markdown"). Con
+    pdf=True los .tex generados se compilan con compilacion_pdf.compilar_lote;
+    opciones_pdf (cache, formato, ...) se pasan tal cual.
+    """
+    inicio = time.perf_counter()
+    os.makedirs(directorio, exist_ok=True)
+    _nombres_unicos(trabajos, prefijo)
+    procesos = max(1, min(procesos or os.cpu_count() or 1, len(trabajos) or 1))
+
+    # Bloques de trabajos para no pagar la comunicación entre procesos por cada matriz
+    tamano = max(1, min(64, len(trabajos) // (procesos * 4) or 1))
+    bloques = [(trabajos[i:i + tamano], directorio, formato_salida)
+               for i in range(0, len(trabajos), tamano)]
+    if procesos == 1:
+        resultados = [r for bloque in map(_procesar_bloque, bloques) for r in bloque]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = [r for bloque in pool.map(_procesar_bloque, bloques) for r in bloque]
+
+    if pdf and formato_salida == "tex":
+        from compilacion_pdf import compilar_lote
+        compilables = [r for r in resultados if r["ok"]]
+        compilados = compilar_lote([(r["tex"][:-len(".tex")], pathlib.Path(r["tex"]))
+                                    for r in compilables],
+                                   max_procesos=procesos, **opciones_pdf)
+        for resultado, compilado in zip(compilables, compilados):
+            resultado["pdf"] = compilado["pdf"]
+            resultado["ok"] = compilado["ok"]
+            resultado["error"] = compilado["error"]
+
+    errores = sum(not r["ok"] for r in resultados)
+    return {
+        "trabajos": len(resultados),
+        "correctos": len(resultados) - errores,
+        "errores": errores,
+        "directorio": os.path.abspath(directorio),
+        "segundos": time.perf_counter() - inicio,
+        "resultados": resultados,
+    }
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Genera documentos de álgebra lineal por lotes a partir de un archivo de trabajos")
+    parser.add_argument("archivo", help="Archivo de trabajos (.jsonl, .npy o .npz)")
+    parser.add_argument("-o", "--salida", default="salida_lotes", help="Directorio de salida")
+    parser.add_argument("--operaciones", nargs="+", choices=OPERACIONES, default=["determinante"],
+                        help="Operaciones para archivos .npy/.npz (y JSONL sin operaciones)")
+    parser.add_argument("-j", "--procesos", type=int, default=None,
+                        help="Número de procesos (por defecto, uno por CPU)")
+    parser.add_argument("--exacto", action="store_true", help="Usa el modo exacto de Bareiss")
+    parser.add_argument("--prefijo", default="", help="Prefijo de los archivos generados")
+    parser.add_argument("--formato", choices=("tex",) + tuple(FORMATOS), default="tex",
+                        help="Documento a escribir: .tex o vista previa HTML/Markdown sin TeX")
+    parser.add_argument("--pdf", action="store_true", help="Compila también los PDF")
+    parser.add_argument("--cache", action="store_true", help="Usa la caché de PDFs compilados")
+    parser.add_argument("--formato-precompilado", action="store_true",
+                        help="Compila contra un preámbulo precompilado")
+    parser.add_argument("--resumen", help="Escribe el resumen JSON en este archivo además de stdout")
+    args = parser.parse_args(argv)
+    if args.pdf and args.formato != "tex":
+        parser.error("--pdf solo se puede usar con --formato tex")
+
+    opciones_pdf = {}
+    if args.cache:
+        from compilacion_pdf import CachePDF
+        opciones_pdf["cache"] = CachePDF()
+    if args.formato_precompilado:
+        from compilacion_pdf import FormatoPreambulo
+        opciones_pdf["formato"] = FormatoPreambulo()
+
+    try:
+        trabajos = leer_trabajos(args.archivo, args.operaciones, args.exacto)
+    except (OSError, ValueError) as e:
+        print(json.dumps({"error": str(e)}, ensure_ascii=False))
+        return 2
+
+    resumen = procesar_lote(trabajos, args.salida, args.procesos, args.pdf, args.prefijo,
+                            formato_salida=args.formato, **opciones_pdf)
+    if "cache" in opciones_pdf:
+        resumen["cache"] = opciones_pdf["cache"].estadisticas()
+
+    texto = json.dumps(resumen, ensure_ascii=False)
+    print(texto)
+    if args.resumen:
+        with open(args.resumen, "w", encoding="utf-8") as archivo:
+            archivo.write(texto)
+    return 0 if resumen["errores"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+Servidor de trabajos del Sistema de Álgebra Lineal
+Servidor asyncio de larga duración en un socket Unix o en TCP local: recibe
+trabajos en JSON (una línea por trabajo, mismo formato que procesar_lotes),
+calcula en un pool de procesos que importa NumPy y PyLaTeX una sola vez,
+compila los PDF con un número acotado de compilaciones simultáneas y
+devuelve cada resultado en cuanto termina, como una línea JSON
+
+La cola de trabajos es acotada: cuando está llena el servidor deja de leer
+de la conexión hasta que haya espacio, de modo que el cliente queda frenado
+por el propio control de flujo del socket.
+
+Uso:
+    python servidor.py servidor --socket /tmp/algebra.sock -o salida_servidor
+    python servidor.py cliente trabajos.jsonl --socket /tmp/algebra.sock
+
+Además de los trabajos, la línea {"comando": "estado"} devuelve el estado
+del servidor (cola, trabajos activos y terminados).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from procesar_lotes import nombre_archivo, procesar_trabajo, trabajos_desde_json
+from vista_previa import FORMATOS
+
+
+# Tamaño máximo de una línea JSON (matrices grandes)
+LIMITE_LINEA = 64 * 1024 ** 2
+
+
+def _precargar():
+    """Inicializador de los procesos del pool: importa una vez las dependencias pesadas"""
+    import matrix_operations
+    matrix_operations._cargar_pylatex()
+
+
+class ServidorTrabajos:
+    """Servidor asyncio con concurrencia acotada
+
+    - max_cola: trabajos en espera antes de aplicar contrapresión.
+    - procesos: tamaño del pool de cálculo (y de trabajos simultáneos).
+    - max_compilaciones: compilaciones LaTeX simultáneas.
+    formato_salida es el tipo de documento por defecto ("tex", "html" o
+    "markdown"). opciones_pdf es un diccionario de opciones de compilación
+    (cache, formato, ...) que se pasan a compilar_tex.
+    """
+
+    def __init__(self, directorio="salida_servidor", procesos=None, max_cola=64,
+                 max_compilaciones=2, formato_salida="tex", opciones_pdf=None):
+        self.directorio = os.path.abspath(directorio)
+        self.procesos = procesos or os.cpu_count() or 1
+        self.max_cola = max_cola
+        self.max_compilaciones = max_compilaciones
+        self.formato_salida = formato_salida
+        self.opciones_pdf = dict(opciones_pdf or {})
+        self.cola = None
+        self.pool = None
+        self.servidor = None
+        self.activos = 0
+        self.terminados = 0
+        self.errores = 0
+        self._contador = itertools.count(1)
+        self._compilaciones = None
+        self._trabajadores = []
+
+    async def iniciar(self, socket=None, host="127.0.0.1", puerto=0):
+        """Abre el pool y empieza a escuchar; devuelve la dirección de escucha"""
+        os.makedirs(self.directorio, exist_ok=True)
+        self.cola = asyncio.Queue(self.max_cola)
+        self._compilaciones = asyncio.Semaphore(self.max_compilaciones)
+        # Sin fork: un hijo creado con fork heredaría los sockets de los clientes
+        # ya conectados y estos no recibirían el cierre de la conexión
+        metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() \
+            else "spawn"
+        self.pool = ProcessPoolExecutor(max_workers=self.procesos, initializer=_precargar,
+                                        mp_context=multiprocessing.get_context(metodo))
+        self._trabajadores = [asyncio.create_task(self._trabajador())
+                              for _ in range(self.procesos)]
+        if socket is not None:
+            if os.path.exists(socket):
+                os.unlink(socket)
+            self.servidor = await asyncio.start_unix_server(self._atender, socket,
+                                                            limit=LIMITE_LINEA)
+            return socket
+        self.servidor = await asyncio.start_server(self._atender, host, puerto,
+                                                   limit=LIMITE_LINEA)
+        return self.servidor.sockets[0].getsockname()[:2]
+
+    async def detener(self):
+        """Deja de aceptar conexiones y libera el pool"""
+        if self.servidor is not None:
+            self.servidor.close()
+            await self.servidor.wait_closed()
+        for tarea in self._trabajadores:
+            tarea.cancel()
+        await asyncio.gather(*self._trabajadores, return_exceptions=True)
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    def estado(self):
+        return {"cola": self.cola.qsize(), "max_cola": self.max_cola, "activos": self.activos,
+                "terminados": self.terminados, "errores": self.errores,
+                "procesos": self.procesos, "max_compilaciones": self.max_compilaciones}
+
+    async def _atender(self, lector, escritor):
+        """Lee los trabajos de una conexión y devuelve sus resultados al terminar cada uno"""
+        respuestas = set()
+        try:
+            numero = 0
+            async for linea in lector:
+                numero += 1
+                if not linea.strip():
+                    continue
+                try:
+                    datos = json.loads(linea)
+                    if datos.get("comando") == "estado":
+                        await self._enviar(escritor, {"estado": self.estado()})
+                        continue
+                    formato = datos.get("formato", self.formato_salida)
+                    if formato != "tex" and formato not in FORMATOS:
+                        raise ValueError(f"Formato no soportado: {formato}")
+                    pdf = bool(datos.get("pdf", False))
+                    if pdf and formato != "tex":
+                        raise ValueError("pdf solo se puede usar con formato tex")
+                    trabajos = trabajos_desde_json(datos, numero)
+                except (ValueError, TypeError, AttributeError) as e:
+                    await self._enviar(escritor, {"linea": numero, "ok": False,
+                                                  "error": f"{type(e).__name__}: {e}"})
+                    continue
+
+                for trabajo in trabajos:
+                    trabajo["nombre"] = nombre_archivo(trabajo, f"{next(self._contador):06d}_")
+                    futuro = asyncio.get_running_loop().create_future()
+                    # Contrapresión: con la cola llena se espera aquí y no se lee más
+                    await self.cola.put((trabajo, formato, pdf, futuro))
+                    respuesta = asyncio.create_task(self._responder(futuro, escritor))
+                    respuestas.add(respuesta)
+                    respuesta.add_done_callback(respuestas.discard)
+
+            # Fin de la entrada: se esperan los resultados pendientes de esta conexión
+            await asyncio.gather(*respuestas, return_exceptions=True)
+        except ValueError as e:
+            # Línea más larga que LIMITE_LINEA: no se puede seguir leyendo la conexión
+            try:
+                await self._enviar(escritor, {"ok": False, "error": f"{type(e).__name__}: {e}"})
+            except ConnectionError:
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, futuro, escritor):
+        resultado = await futuro
+        try:
+            await self._enviar(escritor, resultado)
+        except ConnectionError:
+            pass
+
+    @staticmethod
+    async def _enviar(escritor, datos):
+        escritor.write(json.dumps(datos, ensure_ascii=False).encode("utf-8") + b"\n")
+        await escritor.drain()
+
+    async def _trabajador(self):
+        """Toma trabajos de la cola: cálculo en el pool y compilación acotada"""
+        bucle = asyncio.get_running_loop()
+        while True:
+            trabajo, formato, pdf, futuro = await self.cola.get()
+            self.activos += 1
+            try:
+                resultado = await bucle.run_in_executor(self.pool, procesar_trabajo, trabajo,
+                                                        self.directorio, formato)
+                if pdf and resultado["ok"]:
+                    await self._compilar(resultado)
+            except Exception as e:
+                resultado = {"id": trabajo["id"], "operacion": trabajo["operacion"],
+                             "ok": False, "error": f"{type(e).__name__}: {e}"}
+            finally:
+                self.activos -= 1
+                self.cola.task_done()
+            self.terminados += 1
+            self.errores += not resultado["ok"]
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+    async def _compilar(self, resultado):
+        """Compila el .tex de un resultado; como mucho max_compilaciones a la vez"""
+        from compilacion_pdf import compilar_tex
+
+        async with self._compilaciones:
+            inicio = time.perf_counter()
+            base = resultado["tex"][:-len(".tex")]
+            try:
+                # compilar_tex ejecuta LaTeX como subproceso; el hilo solo espera
+                resultado["pdf"] = await asyncio.to_thread(
+                    compilar_tex, pathlib.Path(resultado["tex"]), base, conservar_tex=False,
+                    **self.opciones_pdf)
+            except Exception as e:
+                resultado["ok"] = False
+                resultado["error"] = str(e)
+            resultado["segundos_pdf"] = time.perf_counter() - inicio
+
+
+async def enviar_trabajos(trabajos, socket=None, host="127.0.0.1", puerto=None):
+    """Cliente local: envía trabajos y genera las respuestas al llegar
+
+    Cada trabajo es un diccionario o una línea JSON ya serializada (que se
+    envía tal cual y la valida el servidor).
+
+    Las respuestas llegan en orden de terminación, no de envío; cada una
+    lleva el id y la operación del trabajo.
+    """
+    if socket is not None:
+        lector, escritor = await asyncio.open_unix_connection(socket, limit=LIMITE_LINEA)
+    else:
+        lector, escritor = await asyncio.open_connection(host, puerto, limit=LIMITE_LINEA)
+
+    async def escribir():
+        for trabajo in trabajos:
+            if not isinstance(trabajo, str):
+                trabajo = json.dumps(trabajo, ensure_ascii=False)
+            escritor.write(trabajo.encode("utf-8") + b"\n")
+            await escritor.drain()
+        escritor.write_eof()
+
+    envio = asyncio.create_task(escribir())
+    try:
+        async for linea in lector:
+            yield json.loads(linea)
+        await envio
+    finally:
+        envio.cancel()
+        escritor.close()
+
+
+async def _servir(args):
+    opciones_pdf = {}
+    if args.cache:
+        from compilacion_pdf import CachePDF
+        opciones_pdf["cache"] = CachePDF()
+    if args.formato_precompilado:
+        from compilacion_pdf import FormatoPreambulo
+        opciones_pdf["formato"] = FormatoPreambulo()
+
+    servidor = ServidorTrabajos(args.salida, args.procesos, args.max_cola,
+                                args.max_compilaciones, formato_salida=args.formato,
+                                opciones_pdf=opciones_pdf)
+    direccion = await servidor.iniciar(args.socket, args.host, args.puerto)
+    print(json.dumps({"escuchando": direccion}), flush=True)
+    try:
+        await servidor.servidor.serve_forever()
+    finally:
+        await servidor.detener()
+
+
+async def _cliente(args):
+    if args.archivo == "-":
+        lineas = sys.stdin.read().splitlines()
+    else:
+        with open(args.archivo, encoding="utf-8") as archivo:
+            lineas = archivo.read().splitlines()
+    errores = 0
+    async for respuesta in enviar_trabajos(lineas, args.socket, args.host, args.puerto):
+        errores += respuesta.get("ok") is False
+        print(json.dumps(respuesta, ensure_ascii=False), flush=True)
+    return errores
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Servidor de trabajos del Sistema de Álgebra Lineal")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    for nombre, ayuda in (("servidor", "Inicia el servidor"),
+                          ("cliente", "Envía trabajos a un servidor en marcha")):
+        p = subparsers.add_parser(nombre, help=ayuda)
+        p.add_argument("--socket", help="Ruta del socket Unix (por defecto, TCP local)")
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--puerto", type=int, default=8765)
+
+    p_servidor = subparsers.choices["servidor"]
+    p_servidor.add_argument("-o", "--salida", default="salida_servidor", help="Directorio de salida")
+    p_servidor.add_argument("-j", "--procesos", type=int, default=None,
+                            help="Procesos de cálculo (por defecto, uno por CPU)")
+    p_servidor.add_argument("--max-cola", type=int, default=64,
+                            help="Trabajos en espera antes de frenar a los clientes")
+    p_servidor.add_argument("--max-compilaciones", type=int, default=2,
+                            help="Compilaciones LaTeX simultáneas")
+    p_servidor.add_argument("--formato", choices=("tex",) + tuple(FORMATOS), default="tex",
+                            help="Formato por defecto de los documentos")
+    p_servidor.add_argument("--cache", action="store_true", help="Usa la caché de PDFs compilados")
+    p_servidor.add_argument("--formato-precompilado", action="store_true",
+                            help="Compila contra un preámbulo precompilado")
+
+    p_cliente = subparsers.choices["cliente"]
+    p_cliente.add_argument("archivo", help="Archivo JSONL de trabajos (- para la entrada estándar)")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.comando == "servidor":
+            asyncio.run(_servir(args))
+            return 0
+        return 1 if asyncio.run(_cliente(args)) else 0
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
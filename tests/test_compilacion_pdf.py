@@ -0,0 +1,149 @@
+"""
+Pruebas de la compilación a PDF que no necesitan TeX (caché, formatos y
+lectura por bloques de los archivos .tex)
+"""
+
+import pathlib
+import sys
+
+import pytest
+
+import compilacion_pdf
+from compilacion_pdf import CachePDF, FormatoPreambulo, compilar_tex
+from matrix_operations import StreamingLaTeXDocumentGenerator
+
+
+TEX = ("\\documentclass{article}%\n\\usepackage{amsmath}%\n\n"
+       "\\usepackage[spanish]{babel}%\n%\n\\title{T}%\n\\begin{document}%\nx\n\\end{document}\n")
+
+
+class FormatoSinTeX(FormatoPreambulo):
+    """Formato que no ejecuta LaTeX para generar el .fmt"""
+
+    def preparar(self, fijo):
+        return self.nombre(fijo)
+
+
+def test_clave_igual_para_codigo_y_ruta(tmp_path):
+    ruta = tmp_path / "doc.tex"
+    ruta.write_text(TEX, encoding="utf-8")
+    assert CachePDF.clave(ruta) == CachePDF.clave(TEX)
+    assert CachePDF.clave(ruta, "pdflatex", ["-shell-escape"]) == \
+        CachePDF.clave(TEX, "pdflatex", ["-shell-escape"])
+    assert CachePDF.clave(ruta) != CachePDF.clave(TEX, "pdflatex")
+
+
+def test_dividir_por_lineas_como_el_codigo_completo(tmp_path):
+    fijo, resto = FormatoPreambulo.dividir(TEX)
+    assert fijo == TEX[:TEX.index("%\n\\title")]
+    assert fijo + resto == TEX
+
+    ruta = tmp_path / "doc.tex"
+    ruta.write_text(TEX, encoding="utf-8")
+    formato = FormatoSinTeX(tmp_path / "formatos")
+    desde_codigo, desde_ruta = tmp_path / "a.tex", tmp_path / "b.tex"
+    assert compilacion_pdf._escribir_fuente(TEX, desde_codigo, formato) == formato.nombre(fijo)
+    assert compilacion_pdf._escribir_fuente(ruta, desde_ruta, formato) == formato.nombre(fijo)
+    assert desde_ruta.read_text(encoding="utf-8") == desde_codigo.read_text(encoding="utf-8") \
+        == fijo + "\\endofdump\n" + resto
+
+
+def test_streaming_compila_desde_la_ruta(tmp_path, monkeypatch):
+    cache = CachePDF(tmp_path / "cache")
+    doc = StreamingLaTeXDocumentGenerator(str(tmp_path / "doc"))
+    doc.documento_determinante([[4, 7], [2, 6]])
+    doc.cerrar()
+    pdf = tmp_path / "cacheado.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    cache.guardar(CachePDF.clave(pathlib.Path(doc.ruta)), str(pdf))
+
+    def sin_dumps():
+        raise AssertionError("generar_pdf no debe cargar el documento con dumps()")
+
+    monkeypatch.setattr(doc, "dumps", sin_dumps)
+    assert doc.generar_pdf(cache=cache) == str(tmp_path / "doc.pdf")
+    assert (tmp_path / "doc.pdf").read_bytes() == b"%PDF-1.4"
+
+    copia = doc.generar_pdf(str(tmp_path / "copia"), cache=cache)
+    assert copia == str(tmp_path / "copia.pdf")
+    assert (tmp_path / "copia.tex").read_bytes() == pathlib.Path(doc.ruta).read_bytes()
+    assert cache.estadisticas()["aciertos"] == 2
+
+
+def test_sin_compilador_informa_el_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(compilacion_pdf, "COMPILADORES", (("no-existe-latex", []),))
+    ruta = tmp_path / "doc.tex"
+    ruta.write_text(TEX, encoding="utf-8")
+    with pytest.raises(RuntimeError, match="No se encontró un compilador"):
+        compilar_tex(ruta, str(tmp_path / "salida"))
+    assert not (tmp_path / "salida.pdf").exists()
+
+
+def _compilador_falso(tmp_path):
+    """pdflatex falso: registra cada llamada, falla con -ini y si no escribe el PDF"""
+    script = tmp_path / "pdflatex_falso"
+    script.write_text(f"""#!{sys.executable}
+import sys
+with open({str(tmp_path / "llamadas")!r}, "a") as registro:
+    registro.write(("ini" if "-ini" in sys.argv else "compilar") + "\\n")
+if "-ini" in sys.argv:
+    print("! LaTeX Error: File `mylatexformat.ltx' not found.")
+    sys.exit(1)
+open(sys.argv[-1][:-len(".tex")] + ".pdf", "wb").close()
+""", encoding="utf-8")
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_formato_fallido_no_se_reintenta(tmp_path, monkeypatch):
+    compilador = _compilador_falso(tmp_path)
+    monkeypatch.setattr(compilacion_pdf, "COMPILADORES", ((compilador, []),))
+    formato = FormatoPreambulo(tmp_path / "formatos", compilador=compilador)
+    for k in range(4):
+        assert compilar_tex(TEX, str(tmp_path / f"doc{k}"), formato=formato).endswith(".pdf")
+
+    def llamadas():
+        return (tmp_path / "llamadas").read_text().splitlines()
+
+    assert llamadas() == ["ini"] + ["compilar"] * 4
+    assert "mylatexformat.ltx" in formato.error
+
+    # Otro proceso (otra instancia) ve el fallo en disco
+    otro = FormatoPreambulo(tmp_path / "formatos", compilador=compilador)
+    assert otro.preparar(FormatoPreambulo.dividir(TEX)[0]) is None
+    assert otro.error == formato.error
+    assert llamadas().count("ini") == 1
+
+    otro.olvidar_fallos()
+    assert otro.preparar(FormatoPreambulo.dividir(TEX)[0]) is None
+    assert llamadas().count("ini") == 2
+
+
+def test_lote_compila_desde_las_rutas(tmp_path, monkeypatch):
+    compilador = _compilador_falso(tmp_path)
+    rutas = []
+    for k in range(3):
+        ruta = tmp_path / f"doc{k}.tex"
+        ruta.write_text(TEX.replace("x\n", f"{k}\n"), encoding="utf-8")
+        rutas.append(ruta)
+    trabajos = [(str(rutas[0])[:-len(".tex")], rutas[0]),
+                (str(tmp_path / "otro"), str(rutas[1])),
+                (str(tmp_path / "tercero"), rutas[2])]
+
+    def sin_leer(fuente):
+        raise AssertionError("compilar_lote no debe cargar los archivos .tex")
+
+    monkeypatch.setattr(compilacion_pdf, "fuente_tex", sin_leer)
+    cache = CachePDF(tmp_path / "cache")
+    resultados = compilacion_pdf.compilar_lote(trabajos, max_procesos=2, cache=cache,
+                                               compilador=compilador)
+    assert [r["ok"] for r in resultados] == [True] * 3, resultados
+    assert [r["cache"] for r in resultados] == [False] * 3
+    assert (tmp_path / "otro.tex").read_text(encoding="utf-8") == \
+        rutas[1].read_text(encoding="utf-8")
+
+    # Segunda pasada: aciertos con la clave calculada a partir de las rutas
+    resultados = compilacion_pdf.compilar_lote(trabajos, cache=cache, compilador=compilador)
+    assert [r["cache"] for r in resultados] == [True] * 3
+    assert (tmp_path / "llamadas").read_text().splitlines() == ["compilar"] * 3
+    assert rutas[0].read_text(encoding="utf-8") == TEX.replace("x\n", "0\n")
@@ -0,0 +1,69 @@
+"""
+Pruebas de instrumentacion: medir una llamada no debe cambiar su comportamiento
+"""
+
+import numpy as np
+import pytest
+
+import instrumentacion
+from instrumentacion import medido
+from matrix_operations import LinearSystemSolver
+
+
+@pytest.fixture
+def activa():
+    instrumentacion.limpiar()
+    instrumentacion.activar()
+    yield
+    instrumentacion.desactivar()
+    instrumentacion.limpiar()
+
+
+def test_argumentos_por_nombre(activa):
+    A = np.array([[2.0, 1.0], [1.0, 3.0]])
+    x = LinearSystemSolver(A, cache=False).resolver(b=[1, 2])
+    np.testing.assert_allclose(A @ x, [1, 2])
+    (t,) = [t for t in instrumentacion.tramos() if t.nombre == "resolucion_sistema"]
+    assert t.datos == {"n": 2, "k": 1}
+
+
+def test_valores_por_defecto_en_posicion(activa):
+    @medido("prueba", lambda a, b, resultado: {"b": b, "resultado": resultado})
+    def sumar(a, b=10):
+        return a + b
+
+    assert sumar(1) == 11
+    assert sumar(a=1, b=2) == 3
+    assert [t.datos for t in instrumentacion.tramos()] == [{"b": 10, "resultado": 11},
+                                                          {"b": 2, "resultado": 3}]
+
+
+def test_error_en_datos_no_cambia_el_resultado(activa):
+    @medido("prueba", lambda *_: 1 / 0)
+    def identidad(x):
+        return x
+
+    assert identidad(5) == 5
+    (t,) = instrumentacion.tramos()
+    assert t.datos["error_datos"].startswith("ZeroDivisionError")
+
+
+def test_desactivada_no_registra():
+    instrumentacion.limpiar()
+    LinearSystemSolver(np.eye(2), cache=False).resolver(b=[1, 2])
+    assert instrumentacion.tramos() == []
+
+
+def test_volcado_tex_en_lotes_y_en_flujo(activa, tmp_path):
+    from matrix_operations import StreamingLaTeXDocumentGenerator
+    from procesar_lotes import procesar_lote, trabajos_desde_json
+
+    (resultado,) = procesar_lote(trabajos_desde_json({"id": "a", "matriz": [[4, 7], [2, 6]]}),
+                                 tmp_path, procesos=1)["resultados"]
+    with StreamingLaTeXDocumentGenerator(str(tmp_path / "flujo")) as doc:
+        doc.documento_inversa([[4, 7], [2, 6]])
+
+    volcados = [t.datos for t in instrumentacion.tramos() if t.nombre == "volcado_tex"]
+    assert volcados == [{"bytes_tex": (tmp_path / "a_determinante.tex").stat().st_size},
+                        {"flujo": True, "bytes_tex": (tmp_path / "flujo.tex").stat().st_size}]
+    assert resultado["tex"] == str(tmp_path / "a_determinante.tex")
@@ -0,0 +1,628 @@
+"""
+Pruebas de regresión de matrix_operations
+Los registros de pasos, el determinante, los cofactores y el LaTeX de cada
+paso se comparan con el método de Gauss original (fila a fila, copiando la
+matriz en cada paso), que se reproduce aquí como referencia. Las matrices
+diagonales y triangulares no se eliminan (ruta estructurada), así que en
+ellas solo se compara el determinante
+"""
+
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from matrix_operations import (
+    CACHE_FACTORIZACIONES,
+    BareissCalculator,
+    BatchDeterminantCalculator,
+    BatchInverseCalculator,
+    BatchLUFactorization,
+    DeterminantCalculator,
+    FactorizationCache,
+    InverseCalculator,
+    LaTeXMatrixFormatter,
+    MatrixGenerator,
+    RREFCalculator,
+    StructuredFactorization,
+    detectar_estructura,
+    factorizar,
+    rref_por_bloques,
+)
+
+
+def gauss_referencia(matriz):
+    """Método de Gauss original: devuelve (determinante, pasos)"""
+    matriz = np.array(matriz, dtype=float)
+    n = len(matriz)
+    pasos = [("Matriz original:", matriz.copy())]
+    multiplicadores = 1
+
+    for i in range(n):
+        max_fila = i
+        for k in range(i+1, n):
+            if abs(matriz[k][i]) > abs(matriz[max_fila][i]):
+                max_fila = k
+
+        if max_fila != i:
+            matriz[[i, max_fila]] = matriz[[max_fila, i]]
+            multiplicadores *= -1
+            pasos.append((f"Intercambio F{i+1} ↔ F{max_fila+1}:", matriz.copy()))
+
+        if abs(matriz[i][i]) < 1e-10:
+            return 0, pasos
+
+        for j in range(i+1, n):
+            if matriz[j][i] != 0:
+                factor = matriz[j][i] / matriz[i][i]
+                matriz[j] = matriz[j] - factor * matriz[i]
+                pasos.append((f"F{j+1} → F{j+1} - ({factor:.2f})F{i+1}:", matriz.copy()))
+
+    return multiplicadores * np.prod(np.diag(matriz)), pasos
+
+
+def latex_referencia(matriz):
+    """Conversión a LaTeX original (elemento a elemento)"""
+    filas, cols = matriz.shape
+    latex_str = r"\begin{bmatrix}" + "\n"
+    for i in range(filas):
+        latex_str += " & ".join(f"{matriz[i][j]:.2f}" if isinstance(matriz[i][j], float)
+                                else str(matriz[i][j]) for j in range(cols))
+        if i < filas - 1:
+            latex_str += r" \\" + "\n"
+    return latex_str + "\n" + r"\end{bmatrix}"
+
+
+def cofactores_referencia(matriz):
+    n = len(matriz)
+    cofactores = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            menor = np.delete(np.delete(matriz, i, axis=0), j, axis=1)
+            cofactores[i, j] = (-1) ** (i + j) * np.linalg.det(menor)
+    return cofactores
+
+
+def matrices_aleatorias(semilla, cantidad=300):
+    """Matrices generales, con ceros, con filas repetidas y singulares"""
+    rng = np.random.default_rng(semilla)
+    for _ in range(cantidad):
+        n = int(rng.integers(1, 8))
+        tipo = rng.integers(4)
+        if tipo == 0:
+            A = rng.integers(-9, 10, (n, n)).astype(float)
+        elif tipo == 1:
+            A = rng.standard_normal((n, n))
+        elif tipo == 2:
+            A = rng.integers(-3, 4, (n, n)) * (rng.random((n, n)) < 0.5)
+        else:
+            # Rango deficiente: filas repetidas o combinaciones
+            r = int(rng.integers(0, n))
+            A = rng.integers(-4, 5, (n, r)) @ rng.integers(-4, 5, (r, n))
+        yield A
+
+
+@pytest.mark.parametrize("semilla", range(8))
+@pytest.mark.parametrize("cache", [None, False])
+def test_pasos_y_determinante_como_el_metodo_original(semilla, cache):
+    formateador = LaTeXMatrixFormatter(recortar_ceros=False)
+    for A in matrices_aleatorias(semilla):
+        det_ref, pasos_ref = gauss_referencia(A)
+        calc = DeterminantCalculator(A, cache=cache)
+        det = calc.calcular_determinante()
+
+        if detectar_estructura(A) != "general":
+            assert det == pytest.approx(det_ref, rel=1e-12, abs=1e-12)
+            assert len(calc.pasos) == 1
+            continue
+        assert det == det_ref
+        pasos = list(calc.pasos)
+        assert len(pasos) == len(calc.pasos) == len(pasos_ref)
+        for (descripcion, mat), (descripcion_ref, mat_ref) in zip(pasos, pasos_ref):
+            assert descripcion == descripcion_ref
+            np.testing.assert_array_equal(mat, mat_ref)
+            assert formateador.formatear(mat) == latex_referencia(mat_ref)
+
+
+def test_registro_por_indice_y_slice():
+    A = np.array([[0, 2, 1], [3, 1, 4], [6, 5, 2]])
+    _, pasos_ref = gauss_referencia(A)
+    calc = DeterminantCalculator(A, cache=False)
+    calc.calcular_determinante()
+    for indice in (0, 1, -1, len(pasos_ref) - 1):
+        descripcion, mat = calc.pasos[indice]
+        assert descripcion == pasos_ref[indice][0]
+        np.testing.assert_array_equal(mat, pasos_ref[indice][1])
+    assert [d for d, _ in calc.pasos[1:3]] == [d for d, _ in pasos_ref[1:3]]
+    with pytest.raises(IndexError):
+        calc.pasos[len(pasos_ref)]
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_cofactores_adjunta_e_inversa(semilla):
+    for A in matrices_aleatorias(semilla, 100):
+        calc = InverseCalculator(A, cache=False)
+        escala = max(1.0, np.abs(A).max()) ** max(len(A) - 1, 1)
+        np.testing.assert_allclose(calc.calcular_cofactores(), cofactores_referencia(np.asarray(A, float)),
+                                   atol=1e-8 * escala)
+        np.testing.assert_allclose(calc.calcular_adjunta(), calc.cofactores.T)
+        if np.linalg.matrix_rank(A) < len(A):
+            continue
+        np.testing.assert_allclose(A @ calc.calcular_inversa(), np.eye(len(A)), atol=1e-8 * escala)
+
+
+def test_cache_propia_vacia_registra_aciertos():
+    A = np.array([[4.0, 7.0, 1.0], [2.0, 6.0, 3.0], [1.0, 5.0, 9.0]])
+    cache = FactorizationCache()
+    globales = CACHE_FACTORIZACIONES.estadisticas()
+
+    DeterminantCalculator(A, cache=cache).calcular_determinante()
+    InverseCalculator(A, cache=cache).calcular_inversa()
+
+    assert cache.estadisticas() == {"aciertos": 1, "fallos": 1, "entradas": 1,
+                                    "bytes": cache.estadisticas()["bytes"]}
+    assert CACHE_FACTORIZACIONES.estadisticas() == globales
+
+    cache.invalidar(A)
+    assert len(cache) == 0
+
+
+def test_cache_propia_respeta_su_limite():
+    cache = FactorizationCache(max_entradas=2)
+    for k in range(1, 5):
+        DeterminantCalculator(np.array([[k, 1.0], [1.0, 2.0]]), cache=cache).calcular_determinante()
+    assert len(cache) == 2
+
+
+def test_cache_propia_cuenta_los_resultados_diferidos():
+    n = 6
+    matrices = [np.eye(n) + np.full((n, n), k) for k in range(1, 4)]
+    cache = FactorizationCache(max_bytes=2 * FactorizationCache.ARREGLOS_POR_ENTRADA * 8 * n * n)
+    for A in matrices:
+        calc = InverseCalculator(A, cache=cache)
+        calc.calcular_inversa()
+        calc.calcular_adjunta()
+    assert len(cache) == 2
+
+    ocupados = 0
+    for f in cache._entradas.values():
+        for arreglo in (f.matriz, f.L, f.U, f._inversa, f._adjunta):
+            ocupados += arreglo.nbytes
+    assert ocupados <= cache.estadisticas()["bytes"] <= cache.max_bytes
+
+
+@pytest.mark.parametrize("A", [
+    [[1, 2, 3], [4, 5, 6], [7, 8, 9]],
+    [[1, 2], [2, 4]],
+    [[0, 0], [0, 0]],
+])
+def test_modo_sin_pasos_detecta_las_mismas_singulares(A, tmp_path):
+    assert DeterminantCalculator(A, cache=False).calcular_determinante() == 0
+    assert DeterminantCalculator(A, trazar=False).calcular_determinante() == 0
+    assert DeterminantCalculator(A, trazar=False).calcular_logdet() == (0.0, -np.inf)
+    ruta = tmp_path / "A.npy"
+    np.save(ruta, np.array(A, dtype=float))
+    assert DeterminantCalculator(str(ruta), trazar=False).calcular_logdet() == (0.0, -np.inf)
+
+
+@pytest.mark.parametrize("semilla", range(2))
+def test_modo_sin_pasos_coincide_con_el_trazado(semilla):
+    for A in matrices_aleatorias(semilla, 150):
+        traza = DeterminantCalculator(A, cache=False)
+        rapido = DeterminantCalculator(A, trazar=False)
+        signo, logdet = traza.calcular_logdet()
+        signo_rapido, logdet_rapido = rapido.calcular_logdet(tamano_bloque=3)
+        assert signo_rapido == signo
+        assert logdet_rapido == pytest.approx(logdet, abs=1e-9)
+
+
+def test_documento_sistema_con_b_de_filas_incorrectas():
+    from vista_previa import PreviewDocumentGenerator
+
+    doc = PreviewDocumentGenerator("t", "markdown")
+    with pytest.raises(ValueError, match="deben tener 2 filas"):
+        doc.documento_sistema([[2, 1], [1, 3]], [1, 2, 3])
+    assert doc.partes == []
+
+    singular = doc.documento_sistema([[1, 2], [2, 4]], [1, 2])
+    assert singular is None
+    assert "Matriz original:" in doc.dumps()
+
+
+def test_terminos_con_dimensiones_incorrectas():
+    from matrix_operations import LinearSystemSolver
+
+    solver = LinearSystemSolver([[2, 1], [1, 3]])
+    with pytest.raises(ValueError, match=r"vector \(2,\) o un bloque \(2, k\).*\(2, 2, 2\)"):
+        solver.validar_terminos(np.ones((2, 2, 2)))
+    with pytest.raises(ValueError, match="deben ser un vector"):
+        solver.validar_terminos(3.0)
+    assert solver.validar_terminos([[1, 2], [3, 4]]).shape == (2, 2)
+
+
+@pytest.mark.parametrize("A, metodo", [
+    ([[2, 1], [1, 3]], "hacia adelante (L y = P b) y después hacia atrás"),
+    ([[2, 1], [0, 3]], "por sustitución hacia atrás"),
+    ([[2, 0], [1, 3]], "por sustitución hacia adelante."),
+    ([[2, 0], [0, 3]], "dividiendo cada ecuación"),
+])
+def test_documento_sistema_describe_la_sustitucion(A, metodo):
+    from vista_previa import PreviewDocumentGenerator
+
+    doc = PreviewDocumentGenerator("t", "markdown")
+    x = doc.documento_sistema(A, [1, 2])
+    np.testing.assert_allclose(np.dot(A, x), [1, 2])
+    assert metodo in doc.dumps()
+
+
+def rref_referencia(matriz, tol=1e-10):
+    """Gauss-Jordan fila a fila con pivoteo parcial: devuelve (R, columnas pivote)"""
+    R = np.array(matriz, dtype=float)
+    m, n = R.shape
+    pivotes = []
+    r = 0
+    for j in range(n):
+        if r == m:
+            break
+        p = max(range(r, m), key=lambda i: abs(R[i, j]))
+        if abs(R[p, j]) < tol:
+            continue
+        R[[r, p]] = R[[p, r]]
+        R[r] = R[r] / R[r, j]
+        for i in range(m):
+            if i != r:
+                R[i] = R[i] - R[i, j] * R[r]
+        pivotes.append(j)
+        r += 1
+    return R, pivotes
+
+
+def matrices_rectangulares(semilla, cantidad=200):
+    """Matrices m×n generales, con columnas nulas y de rango deficiente"""
+    rng = np.random.default_rng(semilla)
+    for _ in range(cantidad):
+        m, n = (int(x) for x in rng.integers(1, 9, 2))
+        tipo = rng.integers(3)
+        if tipo == 0:
+            A = rng.integers(-9, 10, (m, n)).astype(float)
+        elif tipo == 1:
+            A = rng.standard_normal((m, n))
+            A[:, rng.random(n) < 0.3] = 0
+        else:
+            r = int(rng.integers(0, min(m, n) + 1))
+            A = (rng.integers(-4, 5, (m, r)) @ rng.integers(-4, 5, (r, n))).astype(float)
+        yield A
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_rref_como_gauss_jordan_de_referencia(semilla):
+    for A in matrices_rectangulares(semilla):
+        R_ref, pivotes_ref = rref_referencia(A)
+        calc = RREFCalculator(A)
+        R = calc.calcular_rref()
+        assert calc.columnas_pivote == pivotes_ref
+        assert calc.calcular_rango() == np.linalg.matrix_rank(A)
+        np.testing.assert_allclose(R, R_ref, atol=1e-9)
+
+        pasos = list(calc.pasos)
+        assert len(pasos) == len(calc.pasos)
+        assert pasos[0][0] == "Matriz original:"
+        np.testing.assert_array_equal(pasos[0][1], A)
+        np.testing.assert_array_equal(pasos[-1][1], R)
+        intercambios = sum(d.startswith("Intercambio") for d, _ in pasos)
+        assert len(pasos) == 1 + len(pivotes_ref) + intercambios
+
+
+@pytest.mark.parametrize("tamano_bloque", [1, 2, 3, 64])
+@pytest.mark.parametrize("semilla", range(3))
+def test_rref_por_bloques_como_el_trazado(semilla, tamano_bloque):
+    for A in matrices_rectangulares(semilla):
+        trazado = RREFCalculator(A)
+        trazado.calcular_rref()
+        R = A.copy()
+        assert rref_por_bloques(R, tamano_bloque=tamano_bloque) == trazado.columnas_pivote
+        np.testing.assert_allclose(R, trazado.rref, atol=1e-9)
+
+        rapido = RREFCalculator(A, trazar=False)
+        np.testing.assert_allclose(rapido.calcular_rref(), trazado.rref, atol=1e-9)
+        assert rapido.columnas_pivote == trazado.columnas_pivote and rapido.pasos is None
+
+
+@pytest.mark.parametrize("trazar", [True, False])
+def test_espacio_nulo(trazar):
+    for A in matrices_rectangulares(7, 150):
+        calc = RREFCalculator(A, trazar=trazar)
+        N = calc.calcular_espacio_nulo()
+        rango = calc.calcular_rango()
+        assert N.shape == (A.shape[1], A.shape[1] - rango)
+        np.testing.assert_allclose(A @ N, 0, atol=1e-8 * max(1.0, np.abs(A).max()) ** 2)
+        assert np.linalg.matrix_rank(N) == N.shape[1]
+
+
+def test_rref_rechaza_arreglos_que_no_son_matrices():
+    with pytest.raises(ValueError, match="dos dimensiones"):
+        RREFCalculator([1, 2, 3])
+
+
+def det_fraccion(matriz):
+    """Determinante exacto por eliminación de Gauss con Fraction"""
+    M = [[Fraction(int(x)) for x in fila] for fila in matriz]
+    n = len(M)
+    det = Fraction(1)
+    for k in range(n):
+        p = next((i for i in range(k, n) if M[i][k] != 0), None)
+        if p is None:
+            return 0
+        if p != k:
+            M[k], M[p] = M[p], M[k]
+            det = -det
+        det *= M[k][k]
+        for i in range(k + 1, n):
+            factor = M[i][k] / M[k][k]
+            M[i] = [a - factor * b for a, b in zip(M[i], M[k])]
+    return int(det)
+
+
+def adjunta_fraccion(matriz):
+    matriz = np.array(matriz, dtype=object)
+    n = len(matriz)
+    if n == 1:
+        return np.array([[1]], dtype=object)
+    adjunta = np.empty((n, n), dtype=object)
+    for i in range(n):
+        for j in range(n):
+            menor = np.delete(np.delete(matriz, i, axis=0), j, axis=1)
+            adjunta[j, i] = (-1) ** (i + j) * det_fraccion(menor)
+    return adjunta
+
+
+def matrices_enteras(semilla, cantidad=60):
+    """Matrices enteras (algunas con elementos mayores que 2**53) y singulares"""
+    rng = np.random.default_rng(semilla)
+    for _ in range(cantidad):
+        n = int(rng.integers(1, 6))
+        tipo = rng.integers(3)
+        if tipo == 0:
+            A = rng.integers(-9, 10, (n, n))
+        elif tipo == 1:
+            A = np.array(rng.integers(-9, 10, (n, n)), dtype=object) * 10 ** 15 + 1
+        else:
+            r = int(rng.integers(0, n))
+            A = rng.integers(-4, 5, (n, r)) @ rng.integers(-4, 5, (r, n))
+        yield A
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_bareiss_exacto_como_fracciones(semilla):
+    for A in matrices_enteras(semilla):
+        n = len(A)
+        exacta, identidad = np.array(A, dtype=object), np.eye(n, dtype=int).astype(object)
+        det = det_fraccion(A)
+        calc = BareissCalculator(A)
+        assert calc.calcular_determinante() == det
+        assert type(calc.determinante) is int
+        assert len(list(calc.pasos)) == len(calc.pasos)
+
+        adjunta = calc.calcular_adjunta()
+        assert (adjunta == adjunta_fraccion(A)).all()
+        assert (exacta @ adjunta == det * identidad).all()
+        assert (calc.calcular_cofactores() == adjunta.T).all()
+        assert calc.determinante == det
+
+        if det == 0:
+            with pytest.raises(ValueError, match="no tiene inversa"):
+                calc.calcular_inversa()
+            continue
+        inversa = calc.calcular_inversa()
+        assert all(isinstance(x, Fraction) for x in inversa.flat)
+        assert (exacta @ inversa == identidad).all()
+
+
+def test_bareiss_menores_singulares():
+    A = [[1, 2, 3], [2, 4, 6], [1, 0, 1]]
+    calc = BareissCalculator(A)
+    assert calc.calcular_determinante() == 0
+    assert (calc.calcular_adjunta() == adjunta_fraccion(A)).all()
+    assert (BareissCalculator([[0, 0], [0, 0]]).calcular_adjunta() == 0).all()
+
+
+@pytest.mark.parametrize("A", [
+    [[1.5, 2], [3, 4]],
+    [[np.nan, 0], [0, 1]],
+    np.array([[1, Fraction(1, 2)], [0, 1]], dtype=object),
+])
+def test_bareiss_rechaza_no_enteros(A):
+    with pytest.raises(ValueError, match="matriz de enteros"):
+        BareissCalculator(A)
+
+
+def test_bareiss_acepta_flotantes_y_fracciones_enteras():
+    A = np.array([[2, Fraction(4, 2)], [1, 3]], dtype=object)
+    assert BareissCalculator(A).calcular_determinante() == 4
+    assert BareissCalculator([[2.0, 2.0], [1.0, 3.0]]).calcular_determinante() == 4
+
+
+def pila_con_singulares(semilla, k=60, n=4):
+    """Pila (k, n, n) de matrices enteras en la que una de cada tres es singular"""
+    rng = np.random.default_rng(semilla)
+    pila = rng.integers(-9, 10, (k, n, n)).astype(float)
+    for b in range(0, k, 3):
+        r = int(rng.integers(0, n))
+        pila[b] = rng.integers(-4, 5, (n, r)) @ rng.integers(-4, 5, (r, n))
+    return pila
+
+
+@pytest.mark.parametrize("n", [1, 2, 4, 6])
+def test_lote_como_calculo_individual(n):
+    pila = pila_con_singulares(n, n=n)
+    calc = BatchDeterminantCalculator(pila, registrar_pasos=True)
+    dets = calc.calcular_determinantes()
+    escala = 9.0 ** n
+
+    for b, A in enumerate(pila):
+        individual = DeterminantCalculator(A, cache=False)
+        det = individual.calcular_determinante()
+        assert calc.singulares[b] == (det == 0)
+        assert dets[b] == pytest.approx(np.linalg.det(A), abs=1e-9 * escala)
+        if detectar_estructura(A) != "general":
+            continue
+        assert dets[b] == det
+        pasos = list(calc.pasos(b))
+        assert len(pasos) == len(calc.pasos(b)) == len(individual.pasos)
+        for (descripcion, mat), (descripcion_ref, mat_ref) in zip(pasos, individual.pasos):
+            assert descripcion == descripcion_ref
+            np.testing.assert_array_equal(mat, mat_ref)
+
+    pivotes, multiplicadores = calc.obtener_pasos()
+    assert pivotes.shape == (len(pila), n) and multiplicadores.shape == (len(pila), n, n)
+
+
+@pytest.mark.parametrize("n", [1, 3, 5])
+def test_lote_inversas_y_adjuntas(n):
+    pila = pila_con_singulares(10 + n, n=n)
+    todo = BatchInverseCalculator(pila).calcular_todo()
+    assert todo["singulares"].any() and not todo["singulares"].all()
+    escala = 9.0 ** n
+
+    for b, A in enumerate(pila):
+        individual = InverseCalculator(A, cache=False)
+        np.testing.assert_allclose(todo["adjuntas"][b], individual.calcular_adjunta(),
+                                   atol=1e-8 * escala)
+        np.testing.assert_allclose(todo["cofactores"][b], todo["adjuntas"][b].T)
+        if todo["singulares"][b]:
+            assert np.isnan(todo["inversas"][b]).all()
+            assert todo["determinantes"][b] == 0
+        else:
+            np.testing.assert_allclose(todo["inversas"][b], np.linalg.inv(A),
+                                       rtol=1e-9, atol=1e-9)
+
+
+def test_lote_rechaza_formas_y_registro_sin_pasos():
+    with pytest.raises(ValueError, match="forma"):
+        BatchLUFactorization(np.zeros((2, 3, 4)))
+    with pytest.raises(ValueError, match="forma"):
+        BatchLUFactorization(np.eye(3))
+    with pytest.raises(ValueError, match="registrar_pasos"):
+        BatchLUFactorization(np.eye(3)[None]).registro(0)
+
+
+def estructurada(estructura, n, rng):
+    """Matriz aleatoria no singular con la estructura indicada"""
+    A = rng.integers(-9, 10, (n, n)).astype(float)
+    A[np.diag_indices(n)] = rng.choice([-3.0, -2.0, -1.0, 1.0, 2.0, 5.0], n)
+    if estructura == "triangular_superior":
+        return np.triu(A)
+    if estructura == "triangular_inferior":
+        return np.tril(A)
+    if estructura == "identidad":
+        return np.eye(n)
+    return np.diag(np.diag(A))
+
+
+@pytest.mark.parametrize("estructura", ["triangular_superior", "triangular_inferior",
+                                        "diagonal", "identidad"])
+def test_estructuradas_inversa_y_sistemas(estructura):
+    rng = np.random.default_rng(3)
+    for n in range(2, 8):
+        A = estructurada(estructura, n, rng)
+        f = factorizar(A)
+        assert isinstance(f, StructuredFactorization) and f.estructura == estructura
+        assert not f.singular
+
+        pasos = list(f.registro())
+        assert len(pasos) == len(f.registro()) == 1
+        np.testing.assert_array_equal(pasos[0][1], A)
+
+        np.testing.assert_allclose(f.L @ f.U, A, atol=1e-12)
+        assert f.determinante() == pytest.approx(np.linalg.det(A), rel=1e-9)
+        np.testing.assert_allclose(f.inversa(), np.linalg.inv(A), rtol=1e-9, atol=1e-12)
+        b = rng.integers(-9, 10, n).astype(float)
+        B = rng.integers(-9, 10, (n, 3)).astype(float)
+        np.testing.assert_allclose(f.resolver(b), np.linalg.solve(A, b), rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(f.resolver(B), np.linalg.solve(A, B), rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(f.adjunta(), cofactores_referencia(A).T, atol=1e-8)
+
+
+@pytest.mark.parametrize("A", [
+    np.diag([2.0, 0.0, 3.0, 4.0]),
+    np.diag([0.0, 0.0, 3.0]),
+    np.diag([5.0]),
+    np.zeros((3, 3)),
+    np.zeros((1, 1)),
+    np.triu([[1.0, 2.0, 3.0], [0.0, 0.0, 4.0], [0.0, 0.0, 5.0]]),
+    np.tril([[0.0, 0.0, 0.0], [2.0, 1.0, 0.0], [3.0, 4.0, 5.0]]),
+])
+def test_estructuradas_singulares_adjunta_por_menores(A):
+    f = factorizar(A)
+    assert isinstance(f, StructuredFactorization)
+    if len(A) == 1:
+        np.testing.assert_array_equal(f.adjunta(), [[1.0]])
+    else:
+        np.testing.assert_allclose(f.adjunta(), cofactores_referencia(A).T, atol=1e-9)
+    if not np.all(np.diag(A)):
+        assert f.singular and f.determinante() == 0
+        with pytest.raises(ValueError, match="singular"):
+            f.resolver(np.ones(len(A)))
+
+
+def test_estructura_detectada_y_rechazo_de_generales():
+    assert detectar_estructura(np.zeros((2, 2))) == "nula"
+    assert detectar_estructura(np.eye(3)) == "identidad"
+    assert detectar_estructura(np.diag([1, 2])) == "diagonal"
+    assert detectar_estructura([[1, 2], [0, 3]]) == "triangular_superior"
+    assert detectar_estructura([[1, 0], [2, 3]]) == "triangular_inferior"
+    assert detectar_estructura([[1, 2], [3, 4]]) == "general"
+    assert detectar_estructura(np.zeros((2, 3))) == "general"
+    with pytest.raises(ValueError, match="estructura especial"):
+        StructuredFactorization([[1, 2], [3, 4]])
+
+
+@pytest.mark.parametrize("tipo", sorted(MatrixGenerator.TIPOS))
+def test_generar_lote_forma_ceros_y_semilla(tipo):
+    m, n = MatrixGenerator.TIPOS[tipo]
+    lote = MatrixGenerator(5).generar_lote(tipo, k=7)
+    assert lote.shape == (7, m, n)
+    assert np.issubdtype(lote.dtype, np.integer)
+    np.testing.assert_array_equal(lote, MatrixGenerator(5).generar_lote(tipo, k=7))
+    np.testing.assert_array_equal(MatrixGenerator(5).generar(tipo), lote[0])
+
+    for A in lote:
+        if tipo == "nula":
+            assert not A.any()
+        elif tipo == "identidad":
+            np.testing.assert_array_equal(A, np.eye(n))
+        else:
+            assert ((1 <= A) & (A < 10) | (A == 0)).all()
+            estructura = detectar_estructura(A)
+            if tipo == "diagonal":
+                assert estructura == "diagonal" and np.diag(A).all()
+            elif tipo.startswith("triangular"):
+                assert estructura in (tipo, "diagonal")
+                assert np.diag(A).all()
+            else:
+                assert A.all()
+
+
+def test_generar_lote_dimensiones_y_tipo_desconocido():
+    g = MatrixGenerator(0)
+    assert g.generar_lote("fila", 2, n=7).shape == (2, 1, 7)
+    assert g.generar_lote("columna", 2, m=6).shape == (2, 6, 1)
+    assert g.generar_lote("rectangular", 2, 4, 2).shape == (2, 4, 2)
+    assert g.generar_lote("diagonal", 3, n=6).shape == (3, 6, 6)
+    assert g.generar("cuadrada", rango=(-2, -1)).tolist() == [[-2] * 4] * 4
+    with pytest.raises(ValueError, match="no soportado"):
+        g.generar_lote("simetrica")
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 8])
+def test_matrices_invertibles(n):
+    unimodulares = MatrixGenerator(n).matrices_invertibles(n, k=20)
+    np.testing.assert_array_equal(unimodulares, MatrixGenerator(n).matrices_invertibles(n, k=20))
+    for A in unimodulares:
+        assert BareissCalculator(A).calcular_determinante() in (1, -1)
+        inversa = np.linalg.inv(A)
+        np.testing.assert_allclose(inversa, np.round(inversa), atol=1e-6)
+        np.testing.assert_array_equal(A @ np.round(inversa).astype(int), np.eye(n))
+
+    for A in MatrixGenerator(n).matrices_invertibles(n, k=20, unimodular=False):
+        assert BareissCalculator(A).calcular_determinante() != 0
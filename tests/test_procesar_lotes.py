@@ -0,0 +1,70 @@
+"""
+Pruebas del procesamiento por lotes
+"""
+
+import json
+
+import compilacion_pdf
+import procesar_lotes
+from procesar_lotes import procesar_lote, trabajos_desde_json
+
+
+def _escribir_trabajos(ruta, *lineas):
+    ruta.write_text("\n".join(json.dumps(linea) for linea in lineas), encoding="utf-8")
+    return str(ruta)
+
+
+def test_formato_de_salida_y_formato_precompilado_no_chocan(tmp_path):
+    trabajos = trabajos_desde_json({"id": "a", "matriz": [[4, 7], [2, 6]]})
+    resumen = procesar_lote(trabajos, tmp_path, procesos=1, formato_salida="markdown",
+                            formato=object())
+    assert resumen["correctos"] == 1
+    assert resumen["resultados"][0]["vista_previa"].endswith(".md")
+
+
+def test_cli_con_formato_precompilado(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(compilacion_pdf, "DIRECTORIO_CACHE", str(tmp_path / "cache"))
+    archivo = _escribir_trabajos(tmp_path / "trabajos.jsonl",
+                                 {"id": "a", "operaciones": ["determinante", "inversa"],
+                                  "matriz": [[4, 7], [2, 6]]})
+    codigo = procesar_lotes.main([archivo, "-o", str(tmp_path / "salida"), "-j", "1",
+                                  "--formato-precompilado"])
+    resumen = json.loads(capsys.readouterr().out)
+    assert codigo == 0
+    assert resumen["correctos"] == 2
+    assert all(r["tex"].endswith(".tex") for r in resumen["resultados"])
+
+
+def test_sistema_con_b_incorrecto_informa_el_error(tmp_path):
+    trabajos = trabajos_desde_json({"id": "s", "operacion": "sistema",
+                                    "matriz": [[2, 1], [1, 3]], "b": [1, 2, 3]})
+    (resultado,) = procesar_lote(trabajos, tmp_path, procesos=1,
+                                 formato_salida="markdown")["resultados"]
+    assert not resultado["ok"]
+    assert resultado["error"] == "ValueError: Los términos independientes deben tener 2 filas"
+
+
+def test_lineas_invalidas_no_detienen_el_lote(tmp_path, capsys):
+    archivo = tmp_path / "trabajos.jsonl"
+    archivo.write_text("\n".join([
+        json.dumps({"id": "a", "matriz": [[4, 7], [2, 6]]}),
+        "{no es json",
+        json.dumps({"id": "sin_matriz", "operacion": "inversa"}),
+        json.dumps({"id": "b", "operaciones": 5, "matriz": [[1]]}),
+        json.dumps([1, 2]),
+        json.dumps({"id": "c", "operaciones": ["determinante", "inversa"], "matriz": [[2]]}),
+    ]), encoding="utf-8")
+
+    codigo = procesar_lotes.main([str(archivo), "-o", str(tmp_path / "salida"), "-j", "1",
+                                  "--formato", "markdown"])
+    resumen = json.loads(capsys.readouterr().out)
+    assert codigo == 1
+    assert (resumen["trabajos"], resumen["correctos"], resumen["errores"]) == (7, 3, 4)
+    fallidos = {r["id"]: (r["linea"], r["error"]) for r in resumen["resultados"] if not r["ok"]}
+    assert set(fallidos) == {"00002", "sin_matriz", "b", "00005"}
+    assert fallidos["00002"][0] == 2 and fallidos["00002"][1].startswith("JSONDecodeError")
+    assert fallidos["sin_matriz"] == (3, "ValueError: El trabajo sin_matriz no tiene matriz")
+    assert fallidos["b"][0] == 4 and fallidos["b"][1].startswith("ValueError: Las operaciones")
+    assert fallidos["00005"][0] == 5 and fallidos["00005"][1].startswith("AttributeError")
+    assert [(r["id"], r["operacion"]) for r in resumen["resultados"] if r["ok"]] == \
+        [("a", "determinante"), ("c", "determinante"), ("c", "inversa")]
@@ -0,0 +1,53 @@
+"""
+Pruebas del servidor de trabajos en un socket Unix temporal
+"""
+
+import asyncio
+
+from compilacion_pdf import FormatoPreambulo
+from servidor import ServidorTrabajos, enviar_trabajos
+
+
+async def _ejecutar(servidor, socket, trabajos):
+    await servidor.iniciar(str(socket))
+    try:
+        return [r async for r in enviar_trabajos(trabajos, str(socket))]
+    finally:
+        await servidor.detener()
+
+
+def test_formato_de_salida_y_formato_precompilado_no_chocan(tmp_path):
+    formato = FormatoPreambulo(tmp_path / "formatos", compilador="no-existe-latex")
+    servidor = ServidorTrabajos(tmp_path / "salida", procesos=1, formato_salida="markdown",
+                                opciones_pdf={"formato": formato})
+    assert servidor.opciones_pdf == {"formato": formato}
+
+    respuestas = asyncio.run(_ejecutar(servidor, tmp_path / "s.sock", [
+        {"id": "a", "operacion": "determinante", "matriz": [[4, 7], [2, 6]]},
+        {"id": "b", "operacion": "determinante", "matriz": [[4, 7], [2, 6]],
+         "formato": "tex", "pdf": True},
+    ]))
+    por_id = {r["id"]: r for r in respuestas}
+    assert por_id["a"]["ok"] and por_id["a"]["vista_previa"].endswith(".md")
+    # Sin TeX la compilación falla, pero llega a compilar_tex con el formato
+    assert por_id["b"]["tex"].endswith(".tex")
+    assert not por_id["b"]["ok"]
+    assert "No se encontró" in por_id["b"]["error"]
+
+
+def test_trabajo_mal_formado_no_corta_la_conexion(tmp_path):
+    servidor = ServidorTrabajos(tmp_path / "salida", procesos=2, formato_salida="markdown")
+    validos = [{"id": f"v{k}", "operaciones": ["determinante", "inversa"],
+                "matriz": [[4, 7], [2, 6 + k]]} for k in range(5)]
+    trabajos = validos + [{"id": "b", "operaciones": 5, "matriz": [[1]]},
+                          {"id": "w", "operacion": "determinante", "matriz": [[2]]}]
+
+    respuestas = asyncio.run(_ejecutar(servidor, tmp_path / "s.sock", trabajos))
+    assert len(respuestas) == 12
+    errores = [r for r in respuestas if not r["ok"]]
+    assert errores == [{"linea": 6, "ok": False,
+                        "error": "ValueError: Las operaciones del trabajo b deben ser "
+                                 "un texto o una lista de textos"}]
+    correctos = {(r["id"], r["operacion"]) for r in respuestas if r["ok"]}
+    assert correctos == {(f"v{k}", op) for k in range(5) for op in ("determinante", "inversa")} \
+        | {("w", "determinante")}
@@ -0,0 +1,60 @@
+"""
+Pruebas de la vista previa HTML/Markdown y de las primitivas de los generadores
+"""
+
+import contextlib
+
+import numpy as np
+import pytest
+
+from matrix_operations import BaseDocumentGenerator
+from vista_previa import MATHJAX, PreviewDocumentGenerator
+
+
+def test_falta_una_primitiva_falla_al_instanciar():
+    class SinEcuacion(BaseDocumentGenerator):
+        @contextlib.contextmanager
+        def _seccion(self, titulo):
+            yield
+
+        _subseccion = _seccion
+
+        def _texto(self, texto):
+            pass
+
+        _negrita = _texto
+
+        def _formula_en_linea(self, formula, etiqueta="", negrita=False):
+            pass
+
+    with pytest.raises(TypeError, match="_ecuacion"):
+        SinEcuacion()
+
+
+def test_mathjax_por_defecto_y_local():
+    A = np.array([[4, 7], [2, 6]])
+    remoto = PreviewDocumentGenerator("t")
+    remoto.documento_determinante(A)
+    assert f'src="{MATHJAX}"' in remoto.dumps()
+
+    local = PreviewDocumentGenerator("t", mathjax="mathjax/tex-chtml.js")
+    local.documento_determinante(A)
+    assert 'src="mathjax/tex-chtml.js"' in local.dumps()
+    assert "cdn" not in local.dumps()
+
+
+def test_markdown_no_carga_mathjax():
+    doc = PreviewDocumentGenerator("t", "markdown")
+    doc.documento_inversa(np.array([[4, 7], [2, 6]]))
+    assert "<script" not in doc.dumps()
+
+
+def test_politica_de_pasos():
+    A = np.array([[0, 2, 1, 3], [3, 1, 4, 1], [6, 5, 2, 7], [1, 8, 2, 2]])
+    completo = PreviewDocumentGenerator("t", "markdown")
+    completo.documento_determinante(A)
+    recortado = PreviewDocumentGenerator("t", "markdown", politica_pasos=2)
+    recortado.documento_determinante(A)
+    assert recortado.politica_pasos == (2, 2)
+    assert "pasos intermedios" in recortado.dumps()
+    assert "pasos intermedios" not in completo.dumps()
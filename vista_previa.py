@@ -0,0 +1,131 @@
+"""
+Vista previa de los documentos sin TeX
+Genera el mismo contenido que LaTeXDocumentGenerator (tipos de matrices,
+determinante e inversa) como un único archivo HTML con MathJax o como Markdown,
+en milisegundos y sin necesidad de pdflatex; el PDF queda para la salida final
+
+Por defecto el HTML carga MathJax desde un CDN, así que las fórmulas solo se
+dibujan con conexión; para verlo sin red se puede indicar una copia local con
+el parámetro mathjax de PreviewDocumentGenerator.
+"""
+
+import contextlib
+import html
+
+from instrumentacion import tramo
+from matrix_operations import BaseDocumentGenerator
+
+
+FORMATOS = {"html": ".html", "markdown": ".md"}
+
+MATHJAX = "https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-chtml.js"
+
+PLANTILLA_HTML = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{titulo}</title>
+<script defer src="{mathjax}"></script>
+<style>
+body {{ font-family: serif; max-width: 50em; margin: 2em auto; padding: 0 1em; }}
+.texto {{ white-space: pre-line; }}
+.autor {{ text-align: center; }}
+h1 {{ text-align: center; }}
+</style>
+</head>
+<body>
+<h1>{titulo}</h1>
+<p class="autor">Sistema de Álgebra Lineal</p>
+{cuerpo}
+</body>
+</html>
+"""
+
+
+class PreviewDocumentGenerator(BaseDocumentGenerator):
+    """Genera documentos de vista previa en HTML (MathJax) o Markdown
+
+    Usa los mismos registros de pasos y el mismo LaTeXMatrixFormatter que
+    LaTeXDocumentGenerator; MathJax (o el visor de Markdown) dibuja las
+    fórmulas. `mathjax` es la URL o ruta del script tex-chtml.js que carga el
+    HTML (por defecto el CDN; una ruta local permite verlo sin conexión).
+    """
+
+    def __init__(self, titulo="Operaciones con Matrices", formato="html", precision=2,
+                 recortar_ceros=True, mathjax=MATHJAX, politica_pasos=None):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de vista previa no soportado: {formato}")
+        super().__init__(precision, recortar_ceros, politica_pasos)
+        self.titulo = titulo
+        self.formato = formato
+        self.mathjax = mathjax
+        self.partes = []
+
+    @property
+    def es_html(self):
+        return self.formato == "html"
+
+    @contextlib.contextmanager
+    def _seccion(self, titulo):
+        if self.es_html:
+            self.partes.append(f"<section>\n<h2>{html.escape(titulo)}</h2>\n")
+            yield
+            self.partes.append("</section>\n")
+        else:
+            self.partes.append(f"\n## {titulo}\n")
+            yield
+
+    @contextlib.contextmanager
+    def _subseccion(self, titulo):
+        if self.es_html:
+            self.partes.append(f"<h3>{html.escape(titulo)}</h3>\n")
+        else:
+            self.partes.append(f"\n### {titulo}\n")
+        yield
+
+    def _texto(self, texto):
+        if self.es_html:
+            self.partes.append(f'<span class="texto">{html.escape(texto)}</span>\n')
+        else:
+            self.partes.append(texto)
+
+    def _negrita(self, texto):
+        if self.es_html:
+            self.partes.append(f"<strong>{html.escape(texto)}</strong>\n")
+        else:
+            self.partes.append(f"**{texto}**\n")
+
+    def _formula_en_linea(self, formula, etiqueta="", negrita=False):
+        if self.es_html:
+            etiqueta = html.escape(etiqueta)
+            if negrita:
+                etiqueta = f"<strong>{etiqueta}</strong>"
+            self.partes.append(f"<p>{etiqueta}\\({html.escape(formula)}\\)</p>\n")
+        else:
+            if negrita:
+                etiqueta = f"**{etiqueta.rstrip()}** "
+            self.partes.append(f"{etiqueta}${formula}$\n\n")
+
+    def _ecuacion(self, latex):
+        if self.es_html:
+            self.partes.append(f"<div>\\[{html.escape(latex)}\\]</div>\n")
+        else:
+            self.partes.append(f"\n$$\n{latex}\n$$\n")
+
+    def dumps(self):
+        """Devuelve el documento completo como cadena"""
+        cuerpo = "".join(self.partes)
+        if self.es_html:
+            return PLANTILLA_HTML.format(titulo=html.escape(self.titulo),
+                                         mathjax=html.escape(self.mathjax), cuerpo=cuerpo)
+        return f"# {self.titulo}\n\n*Sistema de Álgebra Lineal*\n{cuerpo}"
+
+    def guardar(self, nombre_archivo="output"):
+        """Escribe el documento en nombre_archivo + .html/.md y devuelve la ruta"""
+        ruta = nombre_archivo + FORMATOS[self.formato]
+        with tramo("volcado_vista_previa", formato=self.formato) as t:
+            texto = self.dumps()
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                archivo.write(texto)
+            t.anotar(bytes=len(texto.encode("utf-8")))
+        return ruta